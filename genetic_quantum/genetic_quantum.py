@@ -14,17 +14,25 @@
 
 from libraries.nsga2.nsga2 import NSGA2
 from libraries.nsga2.individual import Individual
-from libraries.simulator.simulator import RoundRobinScheduler
+from libraries.nsga2.islands import IslandModel
+from libraries.nsga2.termination import Termination
+from libraries.nsga2.sorting import STRATEGIES
+from libraries.simulator.simulator import RoundRobinScheduler, ZeroArrivalRoundRobinScheduler
+from libraries.simulator.cache import CachedScheduler
+from libraries.simulator.parallel import ProcessPoolScheduler
+from libraries.simulator.table import MetricsTable
 
 from math import sqrt, sin, pi
 
 #import matplotlib.pyplot as plt
-#import numpy as np
+import numpy as np
 #import random
 #import imageio
 #import os
 #import statistics
 
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import datetime
 import time
@@ -36,9 +44,9 @@ class GeneticQantum(NSGA2):
     # "ZDT1", "ZDT2", "ZDT3" or "GQ"
     TEST_PROBLEM = "GQ"
 
-    def __init__(self, scenario, generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate):
+    def __init__(self, scenario, generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate, metrics_table=None, arrival_aware=False, evaluation_threads=1, evaluation_processes=1, chunk_size=None, sorting_strategy="auto", incremental_sorting=False, seed=None, islands=1, migration_interval=5, migrants=2, in_flight=0, termination=None, array_population=False):
         # Calling the parent constructor
-        super().__init__(generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate)
+        super().__init__(generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate, seed)
 
         self.PLOTS_FOLDER = "resources/" + self.TEST_PROBLEM + "-plots/"
         self.FILE_PREFIX = "Img_"
@@ -49,7 +57,79 @@ class GeneticQantum(NSGA2):
 
         self.SCENARIO = scenario
 
-        self.round_robin = RoundRobinScheduler(self.SCENARIO)
+        self.sorting_strategy = sorting_strategy
+        self.incremental_sorting = incremental_sorting
+        self.array_population = array_population
+
+        # Island model: "islands" populations evolving in worker processes, see islands.py
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.seed = seed
+
+        # The population split among the islands, the remainder spread over the first ones
+        self.island_population_sizes = [population_size // islands + (1 if island < population_size % islands else 0)
+                                        for island in range(islands)]
+
+        # How each island is built: the same configuration, with its own population size
+        self.island_arguments = dict(scenario=scenario, generations=generations,
+                                     genome_min_value=genome_min_value, genome_max_value=genome_max_value,
+                                     crossover_constant=crossover_constant, crossover_rate=crossover_rate,
+                                     metrics_table=metrics_table, arrival_aware=arrival_aware,
+                                     evaluation_threads=evaluation_threads, evaluation_processes=evaluation_processes,
+                                     chunk_size=chunk_size, sorting_strategy=sorting_strategy,
+                                     incremental_sorting=incremental_sorting, array_population=array_population)
+
+        if islands > 1 and min(self.island_population_sizes) < 2:
+            raise ValueError("the population of each island must have at least 2 individuals")
+
+        # Steady-state mode: the evaluations kept running at once, each one waited by a thread
+        self.in_flight = in_flight
+        if in_flight > 0 and islands > 1:
+            raise ValueError("the steady-state mode can't be used with islands")
+
+        # Stopping criteria besides the quantity of generations. Islands stop together, to keep migrating
+        self.termination = termination
+        if termination is not None and islands > 1:
+            raise ValueError("the stopping criteria can't be used with islands")
+
+        self.round_robin = RoundRobinScheduler(self.SCENARIO, arrival_aware=arrival_aware)
+
+        # Bounds of the metrics, the reference point of the hypervolume criterion
+        self.worst_metrics = self.round_robin.worst_metrics()
+
+        # When every process arrives at time zero the metrics are calculated without simulation
+        if self.round_robin.zero_arrival_time():
+            self.round_robin = ZeroArrivalRoundRobinScheduler(self.SCENARIO, arrival_aware=arrival_aware,
+                                                              processes=self.round_robin.processes)
+
+        # Worker processes evaluating the quanta, with the scenario in shared memory
+        self.process_pool = None
+
+        if metrics_table is not None:
+            # Metrics of every quantum already calculated by quantum_sweep.py
+            table = MetricsTable.load(metrics_table)
+            if not table.fingerprint_matches(self.round_robin):
+                raise ValueError("the metrics table " + str(metrics_table) + " wasn't made from " + str(self.SCENARIO) + " with the same simulation mode")
+            self.round_robin = table
+        else:
+            # With islands, the main process only evaluates the merged fronts
+            if evaluation_processes > 1 and islands == 1:
+                self.process_pool = ProcessPoolScheduler(self.round_robin, evaluation_processes, chunk_size)
+                self.round_robin = self.process_pool
+
+            # Every quantum in (k-1, k] has the same metrics, so each one is simulated only once
+            self.round_robin = CachedScheduler(self.round_robin)
+
+        # The simulator is reentrant, so the quanta of a population can be evaluated by many threads
+        self.evaluation_threads = evaluation_threads
+        self.evaluation_executor = None
+        if self.evaluation_threads > 1:
+            self.evaluation_executor = ThreadPoolExecutor(max_workers=self.evaluation_threads)
+
+        self.submission_executor = None
+        if self.in_flight > 0:
+            self.submission_executor = ThreadPoolExecutor(max_workers=self.in_flight)
 
         #self.nsga2_results_folder = "resources/nsga2-results/"
         #Path(self.nsga2_results_folder).mkdir(parents=True, exist_ok=True)
@@ -61,9 +141,24 @@ class GeneticQantum(NSGA2):
 
     def run(self):
         start_time = time.time()
-        best_front = super().run()
+        if self.islands > 1:
+            best_front = self.run_islands()
+        else:
+            best_front = self.evolve()
         runtime = time.time() - start_time
 
+        # Throughput on the standard error, so the output keeps only the best front
+        if self.in_flight > 0:
+            mode = "Steady-state (" + str(self.in_flight) + " in flight)"
+        elif self.islands > 1:
+            mode = "Generational (" + str(self.islands) + " islands)"
+        else:
+            mode = "Generational"
+        sys.stderr.write("# Mode: " + mode + "  Evaluations: " + str(self.evaluations) + "  Runtime: " + '%.2f'%(runtime)
+                         + "s  Evaluations per second: " + '%.2f'%(self.evaluations / max(runtime, 1e-9)) + "\n")
+        if self.islands == 1:
+            sys.stderr.write("# Generations: " + str(self.generations_run) + "  Stopped by: " + self.stop_reason + "\n")
+
         #sys.stderr.write("debug!")
 
         # [NAME] [QUANTUM] [NORMALIZED TURNAROUND TIME] [NORMALIZED WAITING TIME] [NORMALIZED CONTEXT SWITCHES] [NONDOMINATED RANK] [CROWDING DISTANCE] [TURNAROUND TIME] [WAITING TIME] [CONTEXT SWITCHES]
@@ -76,12 +171,36 @@ class GeneticQantum(NSGA2):
             output += str(individual.solutions[2]) + " "
             output += str(individual.non_normalized_solutions[0]) + " "
             output += str(individual.non_normalized_solutions[1]) + " "
-            output += str(individual.non_normalized_solutions[2]) + "\n"
+            output += str(int(individual.non_normalized_solutions[2])) + "\n"
             #output += str(individual.rank) + " "
             #output += str(individual.crowding_distance) + "\n"
 
         print(output)
 
+    def run_islands(self):
+        '''Run the island model and return the best front of all the islands merged'''
+
+        try:
+            island_model = IslandModel(GeneticQantum, self.island_arguments, self.islands,
+                                       self.migration_interval, self.migrants, self.seed,
+                                       self.island_population_sizes)
+            genomes = island_model.run()
+            self.evaluations = island_model.evaluations
+
+            return self.merge_fronts(genomes)
+        finally:
+            self.close()
+
+    def close(self):
+        '''Stop the evaluation threads and worker processes'''
+
+        if self.evaluation_executor is not None:
+            self.evaluation_executor.shutdown()
+        if self.submission_executor is not None:
+            self.submission_executor.shutdown()
+        if self.process_pool is not None:
+            self.process_pool.close()
+
     # NSGA-II
     def evaluate(self, population):
         '''How the individuals are evaluated'''
@@ -89,7 +208,7 @@ class GeneticQantum(NSGA2):
         if self.TEST_PROBLEM.upper() == "GQ":
             for individual in population.individuals:
                 # Evaluating only the individuals that doesn't have been evaluated before
-                if not individual.solutions:
+                if not individual.evaluated:
                     quantum = individual.genome[0]
                     solutions = self.round_robin.run(quantum)
                     individual.solutions = solutions
@@ -97,19 +216,19 @@ class GeneticQantum(NSGA2):
         if self.TEST_PROBLEM.upper() == "ZDT1":
             for individual in population.individuals:
                 # Evaluating only the individuals that doesn't have been evaluated before
-                if not individual.solutions:
+                if not individual.evaluated:
                     individual.solutions = self.zdt1(individual.genome)
 
         if self.TEST_PROBLEM.upper() == "ZDT2":
             for individual in population.individuals:
                 # Evaluating only the individuals that doesn't have been evaluated before
-                if not individual.solutions:
+                if not individual.evaluated:
                     individual.solutions = self.zdt2(individual.genome)
 
         if self.TEST_PROBLEM.upper() == "ZDT3":
             for individual in population.individuals:
                 # Evaluating only the individuals that doesn't have been evaluated before
-                if not individual.solutions:
+                if not individual.evaluated:
                     individual.solutions = self.zdt3(individual.genome)
 
     # Objective function
@@ -141,18 +260,27 @@ class GeneticQantum(NSGA2):
     def evaluate(self, population):
         '''Call the round robin scheduling simulator to get the solutions for each quantum proposed by the NSGA-II algorithm'''
 
+        # Evaluating only the individuals that doesn't have been evaluated before
+        individuals = [individual for individual in population.individuals if not individual.evaluated]
+
+        # Calling the simulator once for all quanta, or once per thread, and getting the solutions
+        quanta = [individual.genome[0] for individual in individuals]
+        resulting_metrics = self.evaluate_quanta(quanta)
+
+        for individual, metrics in zip(individuals, resulting_metrics.tolist()):
+            # Saving the non normalized solutions
+            avg_turnaround_time, avg_waiting_time, context_switch = metrics
+            individual.non_normalized_solutions = [avg_turnaround_time, avg_waiting_time, int(context_switch)]
+
+        self.normalize(population)
+
+    def normalize(self, population):
+        '''Put into the solutions of each individual its metrics divided by the highest ones of "population"'''
+
         max_turnaround_time = 0
         max_waiting_time = 0
         max_context_switches = 0
 
-        # Calling the simulator and getting the solutions
-        for individual in population.individuals:
-            # Evaluating only the individuals that doesn't have been evaluated before
-            if not individual.solutions:
-                quantum = individual.genome[0]
-                # Saving the non normalized solutions
-                individual.non_normalized_solutions = self.round_robin.run(quantum)
-
         # Updating the max values of each solution
         for individual in population.individuals:
             #solutions = [avg_turnaround_time, avg_waiting_time, context_switch]
@@ -165,11 +293,62 @@ class GeneticQantum(NSGA2):
             if individual.non_normalized_solutions[2] > max_context_switches:
                 max_context_switches = individual.non_normalized_solutions[2]
 
+        # A metric that is zero for every individual stays zero when normalized
+        max_turnaround_time = max_turnaround_time or 1
+        max_waiting_time = max_waiting_time or 1
+        max_context_switches = max_context_switches or 1
+
         # Normalizing the values of each solution and putting them into individuals.solutions list
         for individual in population.individuals:
-            individual.solutions.append(individual.non_normalized_solutions[0] / max_turnaround_time)
-            individual.solutions.append(individual.non_normalized_solutions[1] / max_waiting_time)
-            individual.solutions.append(individual.non_normalized_solutions[2] / max_context_switches)
+            individual.solutions = [individual.non_normalized_solutions[0] / max_turnaround_time,
+                                    individual.non_normalized_solutions[1] / max_waiting_time,
+                                    individual.non_normalized_solutions[2] / max_context_switches]
+
+    def front_key(self, front):
+        '''Return the set of effective quanta of "front": quanta simulated the same way are the same solution'''
+
+        return frozenset(RoundRobinScheduler.effective_quantum(individual.genome[0]) for individual in front.individuals)
+
+    def reference_point(self):
+        '''Return the worst metrics of the scenario. A process waits, at most, for every other
+        process to run, so the waiting time is bounded by the burst summation too'''
+
+        worst_turnaround_time, _, worst_context_switches = self.worst_metrics
+
+        return [worst_turnaround_time, worst_turnaround_time, worst_context_switches]
+
+    def objective_values(self, individual):
+        '''Return the metrics of "individual", which aren't normalized by each population'''
+
+        return individual.non_normalized_solutions
+
+    def submit_evaluation(self, individual):
+        '''Evaluate "individual" in a thread of the steady-state mode, see evaluate_individual'''
+
+        return self.submission_executor.submit(self.evaluate_individual, individual)
+
+    def evaluate_individual(self, individual):
+        '''Evaluate one individual without normalizing: its solutions are the metrics themselves
+        The dominance and the crowding distance don't change with the scale of each objective,
+        so the individuals can be compared before the maximum values are known'''
+
+        avg_turnaround_time, avg_waiting_time, context_switch = self.round_robin.run(individual.genome[0])
+
+        individual.non_normalized_solutions = [avg_turnaround_time, avg_waiting_time, int(context_switch)]
+        individual.solutions = list(individual.non_normalized_solutions)
+
+        return individual.solutions
+
+    def evaluate_quanta(self, quanta):
+        '''Return the metrics of each quantum, splitting them among the evaluation threads'''
+
+        if self.evaluation_executor is None or len(quanta) < 2:
+            return self.round_robin.run_batch(quanta)
+
+        chunk_size = -(-len(quanta) // self.evaluation_threads)
+        chunks = [quanta[i:i+chunk_size] for i in range(0, len(quanta), chunk_size)]
+
+        return np.concatenate(list(self.evaluation_executor.map(self.round_robin.run_batch, chunks)))
 
     # Hypervolume indicator
     def create_front_file(self, best_front, reference_point):
@@ -205,12 +384,62 @@ class GeneticQantum(NSGA2):
         with open(results_file_name, "w") as file_:
             file_.write(output)
 
-scenario = sys.argv[1]
-generations = int(sys.argv[2])
-population_size = int(sys.argv[3])
-genome_min_value = int(sys.argv[4])
-genome_max_value = int(sys.argv[5])
-crossover_constant = int(sys.argv[6])
-crossover_rate = float(sys.argv[7])
-
-GeneticQantum(scenario, generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate).run()
+# Worker processes started with "spawn" import this file, so they must not run it
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genetic quantum")
+    parser.add_argument("scenario")
+    parser.add_argument("generations", type=int)
+    parser.add_argument("population_size", type=int)
+    parser.add_argument("genome_min_value", type=int)
+    parser.add_argument("genome_max_value", type=int)
+    parser.add_argument("crossover_constant", type=int)
+    parser.add_argument("crossover_rate", type=float)
+    parser.add_argument("metrics_table", nargs="?", default=None,
+                        help="table made by quantum_sweep.py, used instead of the simulator")
+    parser.add_argument("--arrival-aware", action="store_true",
+                        help="processes only become READY at their arrival time")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="quantity of threads evaluating each population")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="quantity of worker processes evaluating each population")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="quanta sent to a worker process at once; by default, split evenly among the workers")
+    parser.add_argument("--sorting", choices=STRATEGIES, default="auto",
+                        help="non-dominated sorting algorithm")
+    parser.add_argument("--incremental-sorting", action="store_true",
+                        help="keep the fronts of the survivors and insert only the offspring")
+    parser.add_argument("--array-population", action="store_true",
+                        help="store the populations as arrays, one row per individual")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the random numbers, so the run can be reproduced")
+    parser.add_argument("--islands", type=int, default=1,
+                        help="quantity of populations evolving in worker processes, splitting the population size")
+    parser.add_argument("--migration-interval", type=int, default=5,
+                        help="generations between the migrations of the island model")
+    parser.add_argument("--migrants", type=int, default=2,
+                        help="individuals of the best front sent to the next island on each migration")
+    parser.add_argument("--steady-state", type=int, default=0, metavar="IN_FLIGHT",
+                        help="asynchronous steady-state mode, keeping this quantity of evaluations running at once")
+    parser.add_argument("--stagnation", type=int, default=None, metavar="GENERATIONS",
+                        help="stop when the quanta of the best front don't change for this quantity of generations")
+    parser.add_argument("--hypervolume-epsilon", type=float, default=None,
+                        help="stop when the hypervolume of the best front improves less than this")
+    parser.add_argument("--hypervolume-window", type=int, default=5, metavar="GENERATIONS",
+                        help="generations over which the hypervolume improvement is measured")
+    parser.add_argument("--time-budget", type=float, default=None, metavar="SECONDS",
+                        help="stop after this wall-clock time")
+    parser.add_argument("--max-evaluations", type=int, default=None,
+                        help="stop once this quantity of evaluations is reached, checked after each generation")
+    args = parser.parse_args()
+
+    termination = None
+    if (args.stagnation is not None or args.hypervolume_epsilon is not None
+            or args.time_budget is not None or args.max_evaluations is not None):
+        termination = Termination(args.stagnation, args.hypervolume_epsilon, args.hypervolume_window,
+                                  args.time_budget, args.max_evaluations)
+
+    GeneticQantum(args.scenario, args.generations, args.population_size, args.genome_min_value, args.genome_max_value,
+                  args.crossover_constant, args.crossover_rate, args.metrics_table, args.arrival_aware, args.threads,
+                  args.processes, args.chunk_size, args.sorting,
+                  args.incremental_sorting, args.seed, args.islands, args.migration_interval,
+                  args.migrants, args.steady_state, termination, args.array_population).run()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the array population class, an alternative to the population class
+where every individual is one row of a few arrays
+
+Usage: python -m libraries.nsga2.array_population [INDIVIDUAL_QUANTITY]'''
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .individual import Individual, IndividualView
+from .population import Population
+
+class ArrayPopulation():
+    '''Population of individuals stored as contiguous arrays, one row per individual
+
+    Genomes, raw and normalized solutions, ranks and crowding distances are kept
+    in arrays that grow by doubling, so adding individuals seldom allocates anything.
+    Each individual is an IndividualView of its row, created only when asked for'''
+
+    # "I" for integers and "R" for real values
+    RANDOM_TYPE = "R"
+
+    def __init__(self, genotype_quantity, genome_min_value, genome_max_value, objective_quantity=3, capacity=16, random_generator=None):
+        # Size of genome list
+        self.genotype_quantity = genotype_quantity
+
+        self.genome_min_value = genome_min_value
+        self.genome_max_value = genome_max_value
+
+        self.objective_quantity = objective_quantity
+
+        if random_generator is None:
+            random_generator = np.random.default_rng()
+        self.random_generator = random_generator
+
+        self.size = 0
+
+        capacity = max(capacity, 1)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.genomes = np.zeros((capacity, genotype_quantity), dtype=np.float64)
+        self.non_normalized_solutions = np.zeros((capacity, objective_quantity), dtype=np.float64)
+        self.solutions = np.zeros((capacity, objective_quantity), dtype=np.float64)
+        self.evaluated = np.zeros(capacity, dtype=bool)
+        # 0 when not sorted yet
+        self.ranks = np.zeros(capacity, dtype=np.int64)
+        # NaN when not calculated yet
+        self.crowding_distances = np.full(capacity, np.nan)
+
+    def reserve(self, capacity):
+        '''Make room for "capacity" individuals, at least doubling the arrays when they grow'''
+
+        old_capacity = len(self.ids)
+        if capacity <= old_capacity:
+            return
+
+        capacity = max(capacity, 2 * old_capacity)
+
+        for name in ("ids", "genomes", "non_normalized_solutions", "solutions", "evaluated", "ranks", "crowding_distances"):
+            old_array = getattr(self, name)
+            new_array = np.zeros((capacity,) + old_array.shape[1:], dtype=old_array.dtype)
+            new_array[:self.size] = old_array[:self.size]
+            setattr(self, name, new_array)
+
+        self.crowding_distances[self.size:] = np.nan
+
+    def initiate(self, n_individuals, genomes=None):
+        '''Initialize a new population
+        The first individuals get a copy of "genomes", when given, and the others are random'''
+
+        if genomes:
+            genomes = np.asarray(genomes, dtype=np.float64).reshape(-1, self.genotype_quantity)[:n_individuals]
+            self.new_individuals(genomes)
+            n_individuals -= len(genomes)
+
+        shape = (n_individuals, self.genotype_quantity)
+        if self.RANDOM_TYPE == "R":
+            random_genomes = self.random_generator.uniform(self.genome_min_value, self.genome_max_value, shape)
+        if self.RANDOM_TYPE == "I":
+            random_genomes = self.random_generator.integers(self.genome_min_value, self.genome_max_value + 1, shape)
+
+        self.new_individuals(random_genomes)
+
+    def new_individuals(self, genomes):
+        '''Create one individual for each row of "genomes" and return their indexes'''
+
+        genomes = np.asarray(genomes, dtype=np.float64).reshape(-1, self.genotype_quantity)
+        quantity = len(genomes)
+
+        start = self.size
+        self.reserve(start + quantity)
+
+        # Same counter of Individual, so the names never repeat
+        self.ids[start:start+quantity] = np.arange(Individual.id, Individual.id + quantity)
+        Individual.id += quantity
+
+        self.genomes[start:start+quantity] = genomes
+        self.size += quantity
+
+        return np.arange(start, start + quantity)
+
+    def new_individual(self, genome):
+        '''Create a new individual with "genome", insert into population and return it'''
+
+        return self.individual(int(self.new_individuals([genome])[0]))
+
+    def insert(self, individual):
+        '''Insert a copy of "individual", an Individual or an IndividualView, keeping its name'''
+
+        index = self.size
+        self.reserve(index + 1)
+
+        if isinstance(individual, IndividualView):
+            self.ids[index] = individual.population.ids[individual.index]
+            self.evaluated[index] = individual.population.evaluated[individual.index]
+        else:
+            self.ids[index] = int(individual.name[2:])
+            self.evaluated[index] = individual.evaluated
+
+        self.genomes[index] = individual.genome
+        if self.evaluated[index]:
+            self.solutions[index] = individual.solutions
+            self.non_normalized_solutions[index] = individual.non_normalized_solutions
+        self.ranks[index] = individual.rank or 0
+        self.crowding_distances[index] = individual.crowding_distance if individual.crowding_distance is not None else np.nan
+
+        self.size += 1
+
+    def replace(self, index, individual):
+        '''Put a copy of "individual" in the row "index", keeping its name'''
+
+        if not 0 <= index < self.size:
+            raise IndexError("population index out of range")
+
+        # Written as the row after the last one, and then moved to "index"
+        size = self.size
+        self.insert(individual)
+        for name in ("ids", "genomes", "non_normalized_solutions", "solutions", "evaluated", "ranks", "crowding_distances"):
+            array = getattr(self, name)
+            array[index] = array[size]
+        self.size = size
+
+    def union(self, population):
+        '''Union operation over "population" and current population'''
+
+        if not isinstance(population, ArrayPopulation):
+            for individual in population.individuals:
+                self.insert(individual)
+            return
+
+        start = self.size
+        quantity = population.size
+        self.reserve(start + quantity)
+
+        for name in ("ids", "genomes", "non_normalized_solutions", "solutions", "evaluated", "ranks", "crowding_distances"):
+            getattr(self, name)[start:start+quantity] = getattr(population, name)[:quantity]
+
+        self.size += quantity
+
+    def take(self, indexes):
+        '''Return a new population with the individuals of "indexes", in that order, gathered at once'''
+
+        indexes = np.asarray(indexes, dtype=np.int64)
+
+        population = ArrayPopulation(self.genotype_quantity, self.genome_min_value, self.genome_max_value,
+                                     self.objective_quantity, len(indexes), self.random_generator)
+
+        for name in ("ids", "genomes", "non_normalized_solutions", "solutions", "evaluated", "ranks", "crowding_distances"):
+            getattr(population, name)[:len(indexes)] = getattr(self, name)[indexes]
+
+        population.size = len(indexes)
+
+        return population
+
+    def set_solutions(self, indexes, non_normalized_solutions, solutions):
+        '''Store the solutions of the individuals of "indexes"'''
+
+        self.non_normalized_solutions[indexes] = non_normalized_solutions
+        self.solutions[indexes] = solutions
+        self.evaluated[indexes] = True
+
+    def reset_fronts(self):
+        '''Prepare the population to be sorted in fronts. The ranks are kept in "ranks"'''
+
+        self.fronts = list()
+
+    def individual(self, index):
+        '''Return the individual of row "index"'''
+
+        if not 0 <= index < self.size:
+            raise IndexError("population index out of range")
+
+        return IndividualView(self, index)
+
+    @property
+    def individuals(self):
+        '''List of every individual, as views of the rows'''
+
+        return [IndividualView(self, index) for index in range(self.size)]
+
+    def get_random_individual(self):
+        '''Return a random individual of this population'''
+
+        return IndividualView(self, int(self.random_generator.integers(0, self.size)))
+
+    def memory_usage(self):
+        '''Return the quantity of bytes used by the arrays'''
+
+        return sum(getattr(self, name).nbytes for name in ("ids", "genomes", "non_normalized_solutions", "solutions",
+                                                           "evaluated", "ranks", "crowding_distances"))
+
+    def __len__(self):
+        return self.size
+
+def memory_report(individual_quantity, objective_quantity=3):
+    '''Compare the memory used, and the time spent creating them, by "individual_quantity"
+    evaluated individuals in a Population and in an ArrayPopulation'''
+
+    genomes = np.random.default_rng(1).uniform(1, 300, (individual_quantity, 1))
+    solutions = np.random.default_rng(2).random((individual_quantity, objective_quantity))
+
+    genome_list = genomes.tolist()
+    solution_list = solutions.tolist()
+
+    def objects():
+        population = Population(1, 1, 300)
+        for genome, solution in zip(genome_list, solution_list):
+            population.new_individual(list(genome))
+            population.individuals[-1].non_normalized_solutions = list(solution)
+            population.individuals[-1].solutions = list(solution)
+        return population
+
+    def arrays():
+        array_population = ArrayPopulation(1, 1, 300, objective_quantity)
+        indexes = array_population.new_individuals(genomes)
+        array_population.set_solutions(indexes, solutions, solutions)
+        return array_population
+
+    # Timed without tracemalloc, which slows down every allocation
+    objects_time, objects_memory = _measure(objects)
+    arrays_time, arrays_memory = _measure(arrays)
+
+    result = "# Memory used by " + str(individual_quantity) + " individuals and time to create them\n"
+    result += "Population:      " + '%.2f'%(objects_memory / 2**20) + " MiB  " + '%.4f'%(objects_time) + " s\n"
+    result += "ArrayPopulation: " + '%.2f'%(arrays_memory / 2**20) + " MiB  " + '%.4f'%(arrays_time) + " s\n"
+    result += "Saving:          " + '%.1f'%(objects_memory / max(arrays_memory, 1)) + "x memory  " + '%.1f'%(objects_time / max(arrays_time, 1e-9)) + "x time\n"
+
+    return result
+
+def _measure(create):
+    '''Return the seconds spent by "create" and the bytes used by what it returns'''
+
+    start_time = time.perf_counter()
+    created = create()
+    elapsed_time = time.perf_counter() - start_time
+    del created
+
+    tracemalloc.start()
+    created = create()
+    memory = tracemalloc.get_traced_memory()[0]
+    del created
+    tracemalloc.stop()
+
+    return elapsed_time, memory
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print(memory_report(int(sys.argv[1])))
+    else:
+        for individual_quantity in (10000, 100000):
+            print(memory_report(individual_quantity))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''Scaling benchmark of the non-dominated sorting algorithms
+
+Usage: python -m libraries.nsga2.benchmark [options]
+
+For each size and quantity of objectives, random solutions are sorted by each
+strategy of sorting.py. Each measure repeats the sort until "min_time" seconds
+The dominance strategy needs (N x N) matrices, so it's skipped above "max_dominance"'''
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from .sorting import non_dominated_ranks
+
+def benchmark(solutions, strategy, min_time=0.5):
+    '''Return [sorts, seconds, seconds per sort, fronts] of "strategy" over "solutions"'''
+
+    sorts = 0
+    start_time = time.perf_counter()
+    elapsed_time = 0
+
+    while sorts == 0 or elapsed_time < min_time:
+        ranks = non_dominated_ranks(solutions, strategy)
+        sorts += 1
+        elapsed_time = time.perf_counter() - start_time
+
+    return [sorts, elapsed_time, elapsed_time / sorts, int(ranks.max(initial=0))]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the non-dominated sorting algorithms")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**2, 10**3, 10**4, 10**5])
+    parser.add_argument("--objectives", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--max-dominance", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    generator = np.random.default_rng(args.seed)
+
+    print("# Non-dominated sorting benchmark")
+    print("# Seed: " + str(args.seed))
+    print("# [INDIVIDUALS] [OBJECTIVES] [STRATEGY] [FRONTS] [SORTS] [SECONDS] [SECONDS PER SORT]")
+
+    for individual_quantity in args.sizes:
+        for objective_quantity in args.objectives:
+            solutions = generator.random((individual_quantity, objective_quantity))
+
+            strategies = ["dominance"]
+            if objective_quantity <= 2:
+                strategies.append("sweep")
+            elif objective_quantity == 3:
+                strategies.append("ens")
+
+            for strategy in strategies:
+                if strategy == "dominance" and individual_quantity > args.max_dominance:
+                    print(str(individual_quantity) + " " + str(objective_quantity) + " " + strategy + " - - - -")
+                    continue
+
+                sorts, elapsed_time, seconds_per_sort, fronts = benchmark(solutions, strategy, args.min_time)
+                print(str(individual_quantity) + " " + str(objective_quantity) + " " + strategy + " "
+                      + str(fronts) + " " + str(sorts) + " " + '%.4f'%(elapsed_time) + " " + '%.6f'%(seconds_per_sort))
+                sys.stdout.flush()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''Crowding distance used by NSGA-II'''
+
+from sys import maxsize
+
+import numpy as np
+
+def crowding_distances(solutions):
+    '''Return the crowding distance of each row of "solutions", one row per individual
+    of a front and one column per objective
+
+    For each objective the rows are sorted, and each one gets the distance between
+    its two neighbours divided by the range of that objective. The first and last
+    rows of an objective get "infinite" (maxsize). When every row has the same value
+    in an objective, that objective doesn't change any distance'''
+
+    solutions = np.asarray(solutions, dtype=np.float64)
+    size = solutions.shape[0]
+
+    # With one or two individuals every one of them is at the boundary
+    if size <= 2:
+        return np.full(size, float(maxsize))
+
+    distances = np.zeros(size)
+    boundary = np.zeros(size, dtype=bool)
+
+    for objective in solutions.T:
+        order = np.argsort(objective, kind="stable")
+        values = objective[order]
+
+        value_range = values[-1] - values[0]
+        if value_range == 0:
+            continue
+
+        distances[order[1:-1]] += (values[2:] - values[:-2]) / value_range
+        boundary[order[0]] = True
+        boundary[order[-1]] = True
+
+    distances[boundary] = maxsize
+
+    return distances
@@ -31,16 +31,16 @@ class Individual():
         # List of solutions not normalized by the evaluate method
         self.non_normalized_solutions = list()
 
-        # Quantity of individuals which dominate this individual
-        self.domination_count = 0
-
-        # List of individuals that are dominated by this individual
-        self.dominated_by = list()
-
         self.rank = None
 
         self.crowding_distance = None
 
+    @property
+    def evaluated(self):
+        '''Tell if the individual already has its solutions'''
+
+        return bool(self.solutions)
+
     def dominates(self, individual):
         '''Function that tells if the actual individual dominates another
 
@@ -68,8 +68,6 @@ class Individual():
                 + " " + self.__str_solutions__()
                 + " " + str(self.rank)
                 + " " + self.__str_crowding_distance__()
-                #+ " " + str(self.domination_count)
-                #+ " " + self.__str_dominated_by__()
                 )
 
     def __str_genome__(self):
@@ -106,18 +104,100 @@ class Individual():
 
         return str('%.2f'%(self.crowding_distance))
 
-    def __str_dominated_by__(self):
-        if not self.dominated_by:
-            return "[]"
+class IndividualView():
+    '''Individual stored as one row of an ArrayPopulation
+
+    It only holds the population and the row, so it has no attributes of its own
+    ("__slots__"). Genome and solutions are views of the row, changing them changes
+    the population'''
+
+    __slots__ = ("population", "index")
+
+    def __init__(self, population, index):
+        self.population = population
+        self.index = index
+
+    @property
+    def name(self):
+        return "i~" + str(int(self.population.ids[self.index]))
+
+    @property
+    def genome(self):
+        return self.population.genomes[self.index]
+
+    @property
+    def solutions(self):
+        return self.population.solutions[self.index]
+
+    @solutions.setter
+    def solutions(self, solutions):
+        self.population.solutions[self.index] = solutions
+        self.population.evaluated[self.index] = True
+
+    @property
+    def non_normalized_solutions(self):
+        return self.population.non_normalized_solutions[self.index]
+
+    @non_normalized_solutions.setter
+    def non_normalized_solutions(self, non_normalized_solutions):
+        self.population.non_normalized_solutions[self.index] = non_normalized_solutions
+
+    @property
+    def evaluated(self):
+        return bool(self.population.evaluated[self.index])
+
+    @property
+    def rank(self):
+        # Rank 0 means not sorted yet
+        rank = int(self.population.ranks[self.index])
+        return rank if rank > 0 else None
+
+    @rank.setter
+    def rank(self, rank):
+        self.population.ranks[self.index] = rank if rank is not None else 0
+
+    @property
+    def crowding_distance(self):
+        # NaN means not calculated yet
+        crowding_distance = float(self.population.crowding_distances[self.index])
+        return None if crowding_distance != crowding_distance else crowding_distance
 
-        dominated_by_size = len(self.dominated_by)
-        
-        if dominated_by_size > 1:
-            result = "["
-            for i in range(dominated_by_size-1):
-                result += str(self.dominated_by[i].name) + ", "
-            result += str(self.dominated_by[i+1].name) + "]"
+    @crowding_distance.setter
+    def crowding_distance(self, crowding_distance):
+        self.population.crowding_distances[self.index] = crowding_distance if crowding_distance is not None else float("nan")
+
+    def dominates(self, individual):
+        '''Same as Individual.dominates'''
+
+        first_half = True
+        second_half = False
+
+        for solution, other_solution in zip(self.solutions.tolist(), list(individual.solutions)):
+            first_half = first_half and bool(solution <= other_solution)
+            second_half = second_half or bool(solution < other_solution)
+
+        return (first_half and second_half)
+
+    def __eq__(self, individual):
+        return (isinstance(individual, IndividualView)
+                and individual.population is self.population and individual.index == self.index)
+
+    def __hash__(self):
+        return hash((id(self.population), self.index))
+
+    def __str__(self):
+        if not self.population.evaluated[self.index]:
+            solutions = "[]"
         else:
-            result = "[" + str(self.dominated_by[0].name) + "]"
+            solutions = "[" + ", ".join('%.2f'%(solution) for solution in self.solutions.tolist()) + "]"
 
-        return result
+        if self.crowding_distance is None:
+            crowding_distance = "-"
+        else:
+            crowding_distance = '%.2f'%(self.crowding_distance)
+
+        return (self.name
+                + " [" + " ".join('%.2f'%(genotype) for genotype in self.genome.tolist()) + "]"
+                + " " + solutions
+                + " " + str(self.rank)
+                + " " + crowding_distance)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''File of the island model of NSGA-II
+
+Each island is an independent NSGA-II population evolving in its own process.
+The islands are connected in a ring and, every few generations, each one sends
+its best individuals to the next island, where they take the place of some
+children. In the end, the best front of every island is merged'''
+
+import heapq
+import multiprocessing
+import queue
+import traceback
+
+import numpy as np
+
+# Seconds waiting for the result of some island before checking if every island is still running
+POLL_INTERVAL = 1.0
+
+def _run_island(algorithm_class, arguments, island, inbox, outbox, results, interval, size):
+    '''Build and run the algorithm of one island, in a worker process
+    The genomes of its best front and its quantity of evaluations are put in "results",
+    or the error that stopped it'''
+
+    try:
+        algorithm = algorithm_class(**arguments)
+        algorithm.migration = Migration(inbox, outbox, interval, size)
+
+        best_front = algorithm.evolve()
+
+        genomes = list()
+        if best_front is not None:
+            genomes = [list(individual.genome) for individual in best_front.individuals]
+
+        results.put((island, genomes, algorithm.evaluations, None))
+    except Exception:
+        results.put((island, None, 0, traceback.format_exc()))
+
+class Migration():
+    '''Exchange of individuals between an island and its neighbours in the ring
+
+    Every "interval" generations, the "size" individuals of the best front with the
+    highest crowding distances are sent to the next island, and the ones received
+    from the previous island replace the last children of the offspring population,
+    which still are to be evaluated. Every island waits for its neighbour, so they
+    stay in the same generation'''
+
+    def __init__(self, inbox, outbox, interval, size):
+        if interval <= 0:
+            raise ValueError("migration interval must be greater than zero")
+
+        self.inbox = inbox
+        self.outbox = outbox
+        self.interval = interval
+        self.size = size
+
+    def exchange(self, generation, best_front, offspring_population):
+        '''Return the offspring population of "generation" with the immigrants, if it's a migration generation'''
+
+        if generation % self.interval != 0 or self.size <= 0:
+            return offspring_population
+
+        emigrants = heapq.nlargest(self.size, best_front.individuals, key=lambda individual: individual.crowding_distance)
+        self.outbox.put([list(individual.genome) for individual in emigrants])
+
+        immigrants = self.inbox.get()[:offspring_population.size]
+
+        # The immigrants are evaluated with the children, so they're normalized like them
+        population = offspring_population.take(range(offspring_population.size - len(immigrants)))
+        for genome in immigrants:
+            population.new_individual(genome)
+
+        return population
+
+class IslandModel():
+    '''Runs "islands" NSGA-II algorithms in worker processes, with migration between them
+
+    Each island is built as algorithm_class(**arguments, seed=...) and run with its
+    "evolve" method, which returns its best front. The seeds of the islands come
+    from "seed", so a seeded run can be reproduced. When "population_sizes" is given,
+    island "i" gets population_size=population_sizes[i]'''
+
+    def __init__(self, algorithm_class, arguments, islands, migration_interval=5, migrants=2, seed=None, population_sizes=None):
+        if islands <= 0:
+            raise ValueError("the quantity of islands must be greater than zero")
+        if population_sizes is not None and len(population_sizes) != islands:
+            raise ValueError("there must be one population size per island")
+
+        self.algorithm_class = algorithm_class
+        self.arguments = arguments
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.seed = seed
+        self.population_sizes = population_sizes
+
+        # Quantity of individuals evaluated by every island in the last run
+        self.evaluations = 0
+
+    def run(self):
+        '''Run every island until its last generation and return the genomes of all their best fronts'''
+
+        context = multiprocessing.get_context()
+
+        # Island "i" receives from the island before it in the ring, and sends to the one after it
+        inboxes = [context.Queue() for _ in range(self.islands)]
+        results = context.Queue()
+
+        seeds = np.random.SeedSequence(self.seed).spawn(self.islands)
+
+        workers = list()
+        for island in range(self.islands):
+            arguments = dict(self.arguments, seed=seeds[island])
+            if self.population_sizes is not None:
+                arguments["population_size"] = self.population_sizes[island]
+            worker = context.Process(target=_run_island,
+                                     args=(self.algorithm_class, arguments, island, inboxes[island],
+                                           inboxes[(island + 1) % self.islands], results,
+                                           self.migration_interval, self.migrants))
+            worker.start()
+            workers.append(worker)
+
+        self.evaluations = 0
+
+        fronts = [None] * self.islands
+        # Islands found dead without their result, which may still be on its way
+        dead = set()
+        try:
+            received = 0
+            while received < self.islands:
+                try:
+                    island, genomes, evaluations, error = results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    # An island killed (out of memory, a signal) never reports, so it's checked here
+                    for island, worker in enumerate(workers):
+                        if fronts[island] is None and not worker.is_alive():
+                            if island in dead:
+                                raise RuntimeError("island " + str(island) + " stopped without a result, exit code "
+                                                   + str(worker.exitcode))
+                            dead.add(island)
+                    continue
+
+                if error is not None:
+                    raise RuntimeError("island " + str(island) + " failed:\n" + error)
+                fronts[island] = genomes
+                self.evaluations += evaluations
+                received += 1
+        finally:
+            # When an island fails, the others would wait for its migrants forever
+            failed = None in fronts
+            for worker in workers:
+                if failed and worker.is_alive():
+                    worker.terminate()
+                worker.join()
+
+        return [genome for genomes in fronts for genome in genomes]
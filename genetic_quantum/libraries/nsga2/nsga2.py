@@ -12,15 +12,21 @@
 
 '''Main class of NSGA-II'''
 
-from sys import maxsize
-import random
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from collections import deque
 
+import numpy as np
+
+from .crowding import crowding_distances
 from .population import Population
+from .array_population import ArrayPopulation
+from .sorting import non_dominated_fronts, incremental_ranks, fronts_of_ranks, IncrementalFronts
+from .termination import GENERATIONS
 
 class NSGA2():
     '''Main class of the NSGA-II algorithm'''
 
-    def __init__(self, generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate):
+    def __init__(self, generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate, seed=None):
 
         self.generations = generations
 
@@ -50,8 +56,42 @@ class NSGA2():
         # Percentage to disturb each genotype mutated
         self.disturb_percent = 0.5
 
+        # Every random number comes from here, drawn in batches, like the tournaments of
+        # a whole offspring population. With a "seed", the runs can be reproduced
+        self.random_generator = np.random.default_rng(seed)
+
+        # Non-dominated sorting algorithm: "auto", "dominance", "sweep" or "ens". See sorting.py
+        self.sorting_strategy = "auto"
+
+        # Keeping the fronts of the survivors and inserting only the offspring, see sorting.incremental_ranks
+        self.incremental_sorting = False
+
+        # Populations stored as arrays, one row per individual, see array_population.py
+        self.array_population = False
+
+        # Quantity of objectives, the width of the solution arrays of an array population
+        self.objective_quantity = 3
+
         # "Rt" on NSGA-II paper
-        self.population = Population(self.genotype_quantity, self.genome_min_value, self.genome_max_value)
+        self.population = self.new_population()
+
+        # Genomes put in the initial population, like the best front of a previous run (warm start)
+        self.initial_genomes = list()
+
+        # Exchange of individuals with other islands, see islands.py. None when running alone
+        self.migration = None
+
+        # Steady-state mode: quantity of evaluations kept running at once, see run_steady_state
+        # With 0, the generational mode is used
+        self.in_flight = 0
+
+        # Stopping criteria besides the quantity of generations, see termination.py. None to run every generation
+        self.termination = None
+
+        # Quantity of individuals evaluated and generations run by the last run, and the criterion that stopped it
+        self.evaluations = 0
+        self.generations_run = 0
+        self.stop_reason = None
 
     def run(self):
         '''Method responsible for running the main loop of NSGA-II'''
@@ -59,389 +99,518 @@ class NSGA2():
         debug = False
         plot = False
 
+        self.evaluations = 0
+        self.generations_run = 0
+        self.stop_reason = GENERATIONS
+
+        if self.termination is not None:
+            self.termination.start(self.reference_point())
+
+        if self.in_flight > 0:
+            return self.run_steady_state()
+
         if debug: print("# Initiating generation 0...")
 
-        # Creating a parent population P0
-        self.population.initiate(self.population_size//2)
+        # Creating a parent population P0, starting from scratch on every run
+        self.population = self.new_population()
+        self.population.initiate(self.population_size//2, self.initial_genomes)
 
         self.evaluate(self.population)
+        self.evaluations += self.population.size
 
-        fronts = self.fast_non_dominated_sort()
-        #if debug: self._show_fronts(fronts)
+        # Ranking P0, the fronts themselves aren't needed
+        for _ in self.lazy_non_dominated_sort():
+            pass
+        #if debug: self._show_fronts(self.fast_non_dominated_sort())
 
         # "Q0" on NSGA-II paper
         offspring_population = self.usual_crossover()
         self.evaluate(offspring_population)
+        self.evaluations += offspring_population.size
 
         best_front = None
 
+        # First front of the last generation, as indexes of "best_front_population"
+        best_front_indexes = None
+        best_front_population = None
+
         for i in range(self.generations):
             if debug: print("# Running generation " + str(i+1) + "...")
 
             # "Rt" population: union between "Pt" and "Qt", now with size of "2N"
             self.population.union(offspring_population)
 
-            # "F" on NSGA-II paper
-            fronts = self.fast_non_dominated_sort()
+            if plot: self._save_plot(i+1, self.fast_non_dominated_sort())
+
+            individuals = self.population.individuals
+
+            # "F" on NSGA-II paper, each front only sorted when it's needed, as indexes of the individuals
+            fronts = self.lazy_non_dominated_sort()
+
+            # Indexes of "Pt+1"
+            survivors = list()
+            best_front_indexes = None
 
-            best_front = fronts[0]
+            for front in fronts:
+                # Only the fronts that get into "Pt+1" need the crowding distance
+                distances = crowding_distances([individuals[index].solutions for index in front.tolist()])
+                for index, distance in zip(front.tolist(), distances.tolist()):
+                    individuals[index].crowding_distance = distance
 
-            if plot: self._save_plot(i+1, fronts)
+                if (len(survivors) + front.size) > self.population_size:
+                    # Sort(Fi, <n): the same rank, so the highest crowding distances first
+                    # "Pt+1" = "Pt+1" union fronts[i][1 : "N" - sizeof("Pt+1")]
+                    amount_to_insert = self.population_size - len(survivors)
+                    front = front[np.argsort(-distances, kind="stable")[:amount_to_insert]]
 
-            self.crowding_distance_assignment(fronts)
+                if best_front_indexes is None:
+                    best_front_indexes = front
 
-            # "Pt+1" population
-            next_population = self.new_population()
+                survivors.extend(front.tolist())
 
-            i = 0
-            while (next_population.size + fronts[i].size) <= self.population_size:
-                next_population.union(fronts[i])
-                i += 1
+                # No more fronts are sorted once "Pt+1" is full
+                if len(survivors) >= self.population_size:
+                    break
 
-            # Sort(Fi, <n)
-            self.sort_by_crowded_comparison(fronts[i])
+            best_front_population = self.population
 
-            # "Pt+1" = "Pt+1" union fronts[i][1 : "N" - sizeof("Pt+1")]
-            amount_to_insert = self.population_size - len(next_population.individuals)
-            fronts[i].individuals = fronts[i].individuals[:amount_to_insert]
-            next_population.union(fronts[i])
+            # "Pt+1" population, gathered at once
+            self.population = self.population.take(survivors)
 
-            self.population = next_population
+            self.generations_run = i+1
+
+            # Stopping before the offspring is made, so no evaluation is wasted
+            if self.termination is not None:
+                stop_reason = self.check_termination(best_front_population.take(best_front_indexes))
+                if stop_reason is not None:
+                    self.stop_reason = stop_reason
+                    break
 
             # Make new offspring population. "Qt+1" on NSGA-II paper
             offspring_population = self.crossover()
+
+            if self.migration is not None:
+                # Island model: some children give place to the best individuals of another island
+                offspring_population = self.migration.exchange(i+1, best_front_population.take(best_front_indexes), offspring_population)
+
             self.evaluate(offspring_population)
+            self.evaluations += offspring_population.size
+
+        if best_front_indexes is not None:
+            best_front = best_front_population.take(best_front_indexes)
 
         if debug: print(self._gq_output(best_front))
 
         return best_front
 
-    def evaluate(self, population):
-        '''This method should be implemented by the heir class'''
+    def run_steady_state(self):
+        '''Asynchronous steady-state NSGA-II, without a barrier between generations
+
+        "in_flight" evaluations are kept running at once, see submit_evaluation. Each
+        individual gets into the population as soon as its evaluation is done, where
+        it's ranked among the others by sorting.IncrementalFronts and, once there are
+        more than "N" individuals, the worst one by the crowded comparison operator is
+        removed. Only the fronts changed by an insertion are worked on, and the ranks and
+        crowding distances are kept in arrays, given to the individuals in the end.
+        The children are made two at a time, from the population of that moment.
+        The same quantity of individuals of the generational mode is evaluated, and every
+        "N" evaluations after the initial population count as a generation, for the
+        stopping criteria too'''
 
-        pass
+        budget = self.population_size//2 + self.population_size * (self.generations + 1)
 
-    def new_population(self):
-        '''Return a empty Population object'''
+        self.population = self.new_population()
 
-        return Population(self.genotype_quantity, self.genome_min_value, self.genome_max_value)
+        # One more row for the individual inserted when the population is full
+        self.steady_state_fronts = IncrementalFronts(self.population_size + 1)
+        fronts = self.steady_state_fronts
 
-    def fast_non_dominated_sort(self):
-        '''Sort the individuals according to they dominance and sort them into fronts
-        Everyone check with everyone who dominates who, filling up
-        "domination_count" and "dominated_by" attributes of each individual
-        Also, the first front is created
-        Then the remaining individuals are divided into fronts'''
+        # Individuals waiting for an evaluation, starting from a random population
+        initial_population = self.new_population()
+        initial_population.initiate(min(self.population_size, budget), self.initial_genomes)
+        waiting = deque(initial_population.individuals)
 
-        self.population.reset_fronts()
+        # Evaluations running, and their individuals
+        running = dict()
+        submitted = 0
 
-        # Initializing the fronts list and the first front
-        fronts = list()
-        fronts.append(self.new_population())
+        while submitted < budget or running:
+            while len(running) < self.in_flight and submitted < budget:
+                if not waiting:
+                    # No parents yet: the first evaluations must finish
+                    size = self.population.size
+                    if size == 0:
+                        break
+                    waiting.extend(self.crossover(2, fronts.ranks[:size], fronts.crowding_distances[:size]).individuals)
 
-        # Each of individuals checks if dominates or is dominated with everyone else
-        for i in range(self.population.size):
-            for j in range(self.population.size):
-                current_individual = self.population.individuals[i]
-                other_individual = self.population.individuals[j]
+                individual = waiting.popleft()
+                running[self.submit_evaluation(individual)] = individual
+                submitted += 1
 
-                if i != j: # Ignoring itself
-                    # Checking if dominates or are dominated by the other individuals
-                    if current_individual.dominates(other_individual):
-                        current_individual.dominated_by.append(other_individual)
-                    elif other_individual.dominates(current_individual):
-                        current_individual.domination_count += 1
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
 
-            # Checking if current individual is eligible to the first front
-            if current_individual.domination_count == 0:
-                if current_individual not in fronts[0].individuals:
-                    current_individual.rank = 1
-                    fronts[0].insert(current_individual)
+            for future in done:
+                individual = running.pop(future)
+                # Raising the error of the evaluation, if any
+                future.result()
 
-        # Temporary front
-        #current_front = self.new_population()
+                self.evaluations += 1
+                self.steady_state_insert(individual)
 
-        i = 0
-        while len(fronts[i].individuals) > 0:
-            fronts.append(self.new_population())
-            for individual in fronts[i].individuals:
-                for dominated_individual in individual.dominated_by:
-                    dominated_individual.domination_count -= 1
-
-                    # Now if this dominated individual aren't dominated by anyone, insert into next front
-                    if dominated_individual.domination_count == 0:
-
-                        # "+1" becasue "i" is index value, and rank starts from 1 and not 0
-                        # "+1" because the rank it's for the next front
-                        dominated_individual.rank = i+2
-                        fronts[len(fronts)-1].insert(dominated_individual)
-            i += 1
+                # Each "N" evaluations after the initial population count as a generation
+                offspring_evaluations = self.evaluations - initial_population.size
+                if offspring_evaluations > 0 and offspring_evaluations % self.population_size == 0:
+                    self.generations_run = offspring_evaluations // self.population_size
 
-        # Deleting empty last front created in previously loops
-        del fronts[len(fronts)-1]
+                    if self.termination is not None and submitted < budget:
+                        stop_reason = self.check_termination(self.steady_state_best_front())
+                        if stop_reason is not None:
+                            # No more submissions, only the running evaluations are waited
+                            self.stop_reason = stop_reason
+                            budget = submitted
 
-        return fronts
+        for index in range(self.population.size):
+            individual = self.population.individual(index)
+            individual.rank = int(fronts.ranks[index])
+            individual.crowding_distance = float(fronts.crowding_distances[index])
 
-    def crowding_distance_assignment(self, fronts):
-        '''Calculates the crowding distance value of each individual'''
+        # Until here the solutions may be the metrics themselves, see submit_evaluation:
+        # normalized over the whole population, like each population of the generational mode
+        self.normalize(self.population)
 
-        for population in fronts:
+        return self.steady_state_best_front()
 
-            last_individual_index = len(population.individuals)-1
+    def steady_state_best_front(self):
+        '''Return the first front of the population of the steady-state mode'''
 
-            # Reseting this value because it's a new generation
-            for individual in population.individuals:
-                individual.crowding_distance = 0
+        return self.population.take(self.steady_state_fronts.first_front())
 
-            genome_index = 0
-            for genome_index in range(self.genotype_quantity):
+    def steady_state_insert(self, individual):
+        '''Insert an evaluated "individual" into the population and its front, and remove the
+        worst individual when there are more than "N"'''
 
-                # Sorting current population (front) according to the current objective (genome)
-                population.individuals.sort(key=lambda x: x.genome[genome_index])
+        fronts = self.steady_state_fronts
 
-                # The first and last individuals of current population (front) receive "infinite"
-                population.individuals[0].crowding_distance = maxsize
-                population.individuals[last_individual_index].crowding_distance = maxsize
+        if self.population.size < self.population_size:
+            fronts.insert(self.population.size, individual.solutions)
+            self.population.insert(individual)
+            return
 
-                min_value, max_value = population.get_extreme_neighbours(genome_index)
+        # Full: the new individual gets the extra row, and the worst one of the last front leaves
+        row = self.population_size
+        fronts.insert(row, individual.solutions)
+        worst = fronts.remove_worst()
 
-                # Calculating the crowding distance of each objective (genome) of all individuals
-                for i in range(1, last_individual_index):
-                    right_neighbour_value = population.individuals[i+1].genome[genome_index]
-                    left_neighbour_value = population.individuals[i-1].genome[genome_index]
+        if worst != row:
+            self.population.replace(worst, individual)
+            fronts.move(row, worst)
 
-                    # population.individuals[i].crowding_distance += ((right_neighbour_value - left_neighbour_value) / (max_value - min_value))
-                    if (max_value - min_value) == 0:
-                        # TODO: warning: IN CROWDING DISTANCE: division by zero!
-                        #print("IN CROWDING DISTANCE: division by zero!")
-                        population.individuals[i].crowding_distance += ((right_neighbour_value - left_neighbour_value) / 1)
-                    else:
-                        population.individuals[i].crowding_distance += ((right_neighbour_value - left_neighbour_value) / (max_value - min_value))
+    def check_termination(self, best_front):
+        '''Return the criterion of "termination" that stops the run at "best_front", or None'''
 
-    def crowded_comparison(self, individual_A, individual_B):
-        '''Return the best individual according to the crowded comparison operator
-        in NSGA-II paper'''
+        return self.termination.check(self.evaluations, self.front_key(best_front),
+                                      [self.objective_values(individual) for individual in best_front.individuals])
 
-        if ((individual_A.rank < individual_B.rank)
-            or ((individual_A == individual_B)
-            and (individual_A.crowding_distance > individual_B.crowding_distance))):
-            return individual_A
-        return individual_B
+    def front_key(self, front):
+        '''Return what identifies "front" for the stagnation criterion: the set of its genomes'''
 
-    def sort_by_crowded_comparison(self, population):
-        '''Sort "population" with crowded comparison operator. Bubble sort'''
+        return frozenset(tuple(individual.genome) for individual in front.individuals)
 
-        for i in range(len(population.individuals)-2):
+    def reference_point(self):
+        '''Return the worst value of each objective, for the hypervolume criterion, or None when it isn't known'''
 
-            worst = population.individuals[i]
+        return None
 
-            for j in range(1, len(population.individuals)-i):
+    def objective_values(self, individual):
+        '''Return the objectives of "individual" for the hypervolume criterion, with the same scale along the run'''
 
-                worst = self.crowded_comparison(worst, population.individuals[j])
+        return individual.solutions
 
-            population.individuals.remove(worst)
-            population.individuals.append(worst)
+    def submit_evaluation(self, individual):
+        '''Start the evaluation of "individual" and return a Future, done when it has its solutions
+        Here it's evaluated right away. Heir classes can evaluate it asynchronously'''
 
-        worst = population.individuals[0]
-        population.individuals.remove(worst)
-        population.individuals.append(worst)
+        population = self.new_population()
+        population.insert(individual)
+        self.evaluate(population)
 
-    def tournament_selection(self):
-        '''Binary tournament selection according to crowded comparison operator'''
+        future = Future()
+        future.set_result(individual.solutions)
 
-        first_candidate = self.population.get_random_individual()
-        second_candidate = self.population.get_random_individual()
+        return future
 
-        return self.crowded_comparison(first_candidate, second_candidate)
+    def evolve(self):
+        '''Run NSGA-II and return the best front, releasing the resources of the evaluation in the end'''
 
-    def usual_tournament_selection(self):
-        '''Usual binary tournament selection'''
+        try:
+            return NSGA2.run(self)
+        finally:
+            self.close()
 
-        first_candidate = self.population.get_random_individual()
-        second_candidate = self.population.get_random_individual()
+    def merge_fronts(self, genomes):
+        '''Return the first front of the individuals with "genomes", like the best fronts of
+        many islands, evaluated and sorted together'''
 
-        first_candidate_score = 0
-        second_candidate_score = 0
+        self.population = self.new_population()
+        for genome in genomes:
+            self.population.new_individual(list(genome))
 
-        for i in range(self.genotype_quantity):
-            if first_candidate.genome[i] < second_candidate.genome[i]:
-                first_candidate_score += 1
-                continue
-            if second_candidate.genome[i] < first_candidate.genome[i]:
-                second_candidate_score += 1
+        if not self.population.individuals:
+            return self.population
 
-        if first_candidate_score > second_candidate_score:
-            return first_candidate
+        self.evaluate(self.population)
 
-        return second_candidate
+        best_front = self.population.take(next(self.lazy_non_dominated_sort()))
+        self.crowding_distance_assignment([best_front])
 
-    def crossover(self):
-        '''Create a offspring population using the simulated binary crossover (SBX)
-        and the binary tournament selection according to the crowded comparison operator'''
+        return best_front
 
-        genomes_list = list()
+    def evaluate(self, population):
+        '''This method should be implemented by the heir class'''
 
-        # Getting the quantity of individuals that are needed to create
-        # TODO: This value MUST BE even
-        amount_to_create = self.population_size
+        pass
 
-        # "step = 2" because each iteration generates two children
-        for i in range(0, amount_to_create, 2):
+    def normalize(self, population):
+        '''Normalize the solutions of "population" together. Should be implemented by the heir class,
+        if its solutions are normalized'''
 
-            parent1 = self.tournament_selection()
-            parent2 = self.tournament_selection()
+        pass
 
-            # Checking if crossover will or not be made
-            if random.random() > self.crossover_rate:
-                # When crossover isn't made, the children will be a clone of the parents
-                child1_genome = parent1.genome
-                child2_genome = parent2.genome
-            else:
-                child1_genome, child2_genome = self.simulated_binary_crossover(parent1, parent2)
+    def close(self):
+        '''Release the resources of the evaluation. Should be implemented by the heir class, if needed'''
 
-            genomes_list.append(child1_genome)
-            genomes_list.append(child2_genome)
+        pass
 
-        # Creating the offspring population
-        offspring_population = self.new_population()
+    def new_population(self):
+        '''Return a empty Population object, or ArrayPopulation when "array_population" is set'''
 
-        # Adding the new children on that population
-        for child_genome in genomes_list:
-            offspring_population.new_individual(self.mutation(child_genome))
+        if self.array_population:
+            return ArrayPopulation(self.genotype_quantity, self.genome_min_value, self.genome_max_value,
+                                   self.objective_quantity, random_generator=self.random_generator)
 
-        return offspring_population
+        return Population(self.genotype_quantity, self.genome_min_value, self.genome_max_value, self.random_generator)
+
+    def fast_non_dominated_sort(self):
+        '''Sort the individuals according to they dominance and sort them into fronts
+        Return the list of every front, as populations'''
+
+        return [self.population.take(front) for front in self.lazy_non_dominated_sort()]
+
+    def lazy_non_dominated_sort(self):
+        '''Yield the fronts of the population, from the best one, each front only when it's asked for
+        Each front is an array with the indexes of its individuals in the population, and
+        they get their rank when the front is yielded
+        The fronts are calculated from the matrix of solutions (one row per individual)
+        by the algorithm chosen in "sorting_strategy", see sorting.py'''
+
+        self.population.reset_fronts()
+
+        individuals = self.population.individuals
+
+        if not individuals:
+            return
+
+        solutions = [individual.solutions for individual in individuals]
+
+        # The survivors keep the ranks of the last sort, the offspring don't have one yet
+        known_ranks = [individual.rank or 0 for individual in individuals]
+
+        if self.incremental_sorting and any(known_ranks):
+            fronts = fronts_of_ranks(incremental_ranks(solutions, known_ranks))
+        else:
+            fronts = non_dominated_fronts(solutions, self.sorting_strategy)
+
+        for rank, front in enumerate(fronts, 1):
+            # Each front keeps the individuals in the population order
+            for index in front.tolist():
+                individuals[index].rank = rank
+
+            yield front
+
+    def crowding_distance_assignment(self, fronts):
+        '''Calculates the crowding distance value of each individual, over its solutions (objectives)'''
+
+        for population in fronts:
+            distances = crowding_distances([individual.solutions for individual in population.individuals])
+
+            for individual, distance in zip(population.individuals, distances.tolist()):
+                individual.crowding_distance = distance
+
+    def tournament_selections(self, amount, ranks=None, crowding=None):
+        '''Return "amount" individuals chosen by binary tournaments according to the crowded
+        comparison operator, all of them drawn and decided at once with arrays
+        The ranks and crowding distances of the individuals are read from them, unless given'''
+
+        if ranks is None:
+            individuals = self.population.individuals
+            ranks = np.array([individual.rank for individual in individuals], dtype=np.int64)
+            crowding = np.array([individual.crowding_distance for individual in individuals], dtype=np.float64)
+
+        candidates = self.random_generator.integers(0, len(ranks), size=(amount, 2))
+        first = candidates[:, 0]
+        second = candidates[:, 1]
+
+        # Crowded comparison operator: the lower rank wins, then the higher crowding distance.
+        # On a tie, the second candidate wins
+        first_wins = (ranks[first] < ranks[second]) | ((ranks[first] == ranks[second]) & (crowding[first] > crowding[second]))
+        winners = np.where(first_wins, first, second)
+
+        return [self.population.individual(index) for index in winners.tolist()]
+
+    def usual_tournament_selection(self):
+        '''Usual binary tournament selection'''
+
+        return self.usual_tournament_selections(1)[0]
+
+    def usual_tournament_selections(self, amount):
+        '''Return "amount" individuals chosen by usual binary tournaments, all at once:
+        the winner is the candidate with more genotypes lower than the other one'''
+
+        individuals = self.population.individuals
+        genomes = np.array([individual.genome for individual in individuals], dtype=np.float64).reshape(len(individuals), -1)
+
+        candidates = self.random_generator.integers(0, len(individuals), size=(amount, 2))
+        first = candidates[:, 0]
+        second = candidates[:, 1]
+
+        first_candidate_score = (genomes[first] < genomes[second]).sum(axis=1)
+        second_candidate_score = (genomes[second] < genomes[first]).sum(axis=1)
+
+        # On a tie, the second candidate wins
+        winners = np.where(first_candidate_score > second_candidate_score, first, second)
+
+        return [individuals[index] for index in winners.tolist()]
+
+    def crossover(self, amount_to_create=None, ranks=None, crowding=None):
+        '''Create a offspring population using the simulated binary crossover (SBX)
+        and the binary tournament selection according to the crowded comparison operator
+        It has "N" children, unless "amount_to_create" is given. See tournament_selections
+        for "ranks" and "crowding"'''
+
+        # Getting the quantity of individuals that are needed to create
+        if amount_to_create is None:
+            amount_to_create = self.population_size
+
+        # One tournament per parent, all of them at once. Each pair makes two children,
+        # so with an odd amount one more pair is made and its last child is dropped
+        parents = self.genomes_of(self.tournament_selections(2 * -(-amount_to_create // 2), ranks, crowding))
+        parents1 = parents[0::2]
+        parents2 = parents[1::2]
+
+        children1, children2 = self.simulated_binary_crossovers(parents1, parents2)
+
+        # When crossover isn't made, the children will be a clone of the parents
+        cloned = self.random_generator.random(len(parents1)) > self.crossover_rate
+        children1[cloned] = parents1[cloned]
+        children2[cloned] = parents2[cloned]
+
+        return self.offspring_population(children1, children2, amount_to_create)
 
     def usual_crossover(self):
         '''Create a offspring population using the simulated binary crossover (SBX)
         and the usual binary tournament selection'''
 
-        genomes_list = list()
-
         # Getting the quantity of individuals that are needed to create
-        # TODO: This value MUST BE even
         amount_to_create = self.population_size
 
-        # "step = 2" because each iteration generates two children
-        for _ in range(0, amount_to_create, 2):
+        # An even quantity of parents, the extra child of an odd amount is dropped
+        parents = self.genomes_of(self.usual_tournament_selections(2 * -(-amount_to_create // 2)))
+
+        children1, children2 = self.simulated_binary_crossovers(parents[0::2], parents[1::2])
+
+        return self.offspring_population(children1, children2, amount_to_create)
 
-            parent1 = self.usual_tournament_selection()
-            parent2 = self.usual_tournament_selection()
+    def genomes_of(self, individuals):
+        '''Return the genomes of "individuals" as a matrix, one row per individual'''
 
-            child1_genome, child2_genome = self.simulated_binary_crossover(parent1, parent2)
+        return np.array([individual.genome for individual in individuals], dtype=np.float64).reshape(len(individuals), self.genotype_quantity)
 
-            genomes_list.append(child1_genome)
-            genomes_list.append(child2_genome)
+    def offspring_population(self, children1, children2, amount):
+        '''Mutate the children and create the offspring population with the first "amount"
+        of them, the two children of each pair side by side'''
+
+        children = np.empty((len(children1) + len(children2), self.genotype_quantity), dtype=np.float64)
+        children[0::2] = children1
+        children[1::2] = children2
+        children = children[:amount]
 
-        # Creating the offspring population
         offspring_population = self.new_population()
 
-        # Adding the new children on that
-        for child_genome in genomes_list:
-            offspring_population.new_individual(self.mutation(child_genome))
+        # Adding the new children on that population
+        for child_genome in self.mutations(children).tolist():
+            offspring_population.new_individual(child_genome)
 
         return offspring_population
 
     def simulated_binary_crossover(self, parent1, parent2):
         '''Simulated binary crossover (SBX)'''
 
+        children1, children2 = self.simulated_binary_crossovers(self.genomes_of([parent1]), self.genomes_of([parent2]))
+
+        return children1[0].tolist(), children2[0].tolist()
+
+    def simulated_binary_crossovers(self, parents1, parents2):
+        '''Simulated binary crossover (SBX) of each pair of rows of "parents1" and "parents2"
+        Return the two matrices of children, every genotype calculated at once'''
+
         # Distribution index. "nc" in NSGA-II paper
         crossover_constant = self.crossover_constant
 
-        child1_genome = list()
-        child2_genome = list()
-
-        for j in range(self.genotype_quantity):
-
-            # Each genotype has a 50% chance of changing its value
-            # TODO: This should be removed when dealing with one-dimensional solutions
-            '''
-            if (random.random() > 0.5) and (self.genotype_quantity != 1):
-                # In this case, the children will get the value of the parents
-                child1_genome.append(parent1.genome[j])
-                child2_genome.append(parent2.genome[j])
-                continue
-            '''
-
-            # "y1" is the lowest value between parent1 and parent2. "y2" gets the other value
-            if (parent1.genome[j] < parent2.genome[j]):
-                y1 = parent1.genome[j]
-                y2 = parent2.genome[j]
-            else:
-                y1 = parent2.genome[j]
-                y2 = parent1.genome[j]
-
-            # EPS: precision error tolerance, its value is 1.0e-14 (global constant)
-            eps = 0.000000000000010 #1.0e-14
-            # If the value in parent1 is not the same of parent2
-            if abs(parent1.genome[j] - parent2.genome[j]) > eps:
-                # Lower and upper limit of genotype of an individual
-                lower_bound = self.genome_min_value
-                upper_bound = self.genome_max_value
-
-                u = random.random()
-
-                # Calculation of the first child
-                beta = 1 + (2 / (y2 - y1)) * min((y1 - lower_bound), (upper_bound - y2))
-                alpha = 2 - pow(beta, -(crossover_constant + 1))
-                if u <= (1/alpha):
-                    beta_bar = pow(alpha * u, 1/(crossover_constant + 1))
-                else:
-                    beta_bar = pow(1/(2 - (alpha * u)), 1/(crossover_constant + 1))
-                child1_genotype = 0.5 * ((y1 + y2) - beta_bar * (y2 - y1))
-
-                # Calculation of the second child
-                beta = 1 + (2 / (y2 - y1)) * min((y1 - lower_bound), (upper_bound - y2))
-                alpha = 2 - pow(beta, -(crossover_constant + 1))
-                if u <= (1/alpha):
-                    beta_bar = pow(alpha * u, 1/(crossover_constant + 1))
-                else:
-                    beta_bar = pow(1/(2 - (alpha * u)), 1/(crossover_constant + 1))
-                child2_genotype = 0.5 * ((y1 + y2) + beta_bar * (y2 - y1))
-
-                child1_genome.append(child1_genotype)
-                child2_genome.append(child2_genotype)
-
-            # The paper is not very clear about this, but i assume, in the equation of beta (not beta_bar),
-            # y2 and y1, since they could not have been calculated yet, refer to the parents
-            # So, if both parents are equal at the specified variable, the divisor would be zero
-            # In this case, the children should have the same value as the parents. 
-            else:
-                child1_genome.append(parent1.genome[j])
-                child2_genome.append(parent2.genome[j])
-
-        return child1_genome, child2_genome
+        # Lower and upper limit of genotype of an individual
+        lower_bound = self.genome_min_value
+        upper_bound = self.genome_max_value
+
+        # "y1" is the lowest value between parent1 and parent2. "y2" gets the other value
+        y1 = np.minimum(parents1, parents2)
+        y2 = np.maximum(parents1, parents2)
+
+        # EPS: precision error tolerance, its value is 1.0e-14 (global constant)
+        eps = 0.000000000000010 #1.0e-14
+        # The paper is not very clear about this, but i assume, in the equation of beta (not beta_bar),
+        # y2 and y1, since they could not have been calculated yet, refer to the parents
+        # So, if both parents are equal at the specified variable, the divisor would be zero
+        # In this case, the children should have the same value as the parents
+        different = np.abs(parents1 - parents2) > eps
+
+        u = self.random_generator.random(parents1.shape)
+
+        # Without the parents that are equal, which would divide by zero
+        distance = np.where(different, y2 - y1, 1)
+
+        # The same beta_bar is used by both children
+        beta = 1 + (2 / distance) * np.minimum(y1 - lower_bound, upper_bound - y2)
+        alpha = 2 - np.power(beta, -(crossover_constant + 1))
+        beta_bar = np.where(u <= (1/alpha),
+                            np.power(alpha * u, 1/(crossover_constant + 1)),
+                            np.power(1/(2 - (alpha * u)), 1/(crossover_constant + 1)))
+
+        children1 = np.where(different, 0.5 * ((y1 + y2) - beta_bar * (y2 - y1)), parents1)
+        children2 = np.where(different, 0.5 * ((y1 + y2) + beta_bar * (y2 - y1)), parents2)
+
+        return children1, children2
 
     def mutation(self, genome):
         '''Mutation method'''
 
-        random.seed()
-
-        value = random.random()
-        value = random.uniform(0, 1)
-        # Checking if mutation will or not occur
-        if value > self.mutation_rate:
-            # When mutation doesn't occur, nothing happens
-            return genome
+        return self.mutations(np.array(genome, dtype=np.float64).reshape(1, -1))[0].tolist()
 
-        for i in range(len(genome)):
-            # Mutate that genotype
-            if random.random() < self.genotype_mutation_probability:
+    def mutations(self, genomes):
+        '''Mutate each row of "genomes", all at once, and return the mutated copy
+        Each row is mutated with probability "mutation_rate", and then each genotype with
+        "genotype_mutation_probability", adding or subtracting "disturb_percent" of its value'''
 
-                value = self.disturb_percent * genome[i]
+        shape = genomes.shape
 
-                # Will it add or decrease?
-                if random.random() < 0.5:
-                    value = -value
+        mutated = self.random_generator.random(shape[0]) <= self.mutation_rate
+        disturbed = mutated[:, np.newaxis] & (self.random_generator.random(shape) < self.genotype_mutation_probability)
 
-                genome[i] = genome[i] + value
+        # Will it add or decrease?
+        signs = np.where(self.random_generator.random(shape) < 0.5, -1.0, 1.0)
 
-                # Making sure that it doesn't escape the bounds
-                if genome[i] > self.genome_max_value:
-                    genome[i] = self.genome_max_value
-                elif genome[i] < self.genome_min_value:
-                    genome[i] = self.genome_min_value
+        genomes = genomes + np.where(disturbed, signs * self.disturb_percent * genomes, 0.0)
 
-        return genome
+        # Making sure that it doesn't escape the bounds
+        return np.clip(genomes, self.genome_min_value, self.genome_max_value)
 
     # Utils
     def _show_fronts(self, fronts):
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''Non-dominated sorting algorithms used by NSGA-II
+
+Each one receives a matrix of solutions, one row per individual and one column
+per objective, and returns the rank of each row, starting from 1. They all give
+the same ranks, with the dominance rule of Individual.dominates'''
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from .crowding import crowding_distances
+
+# "dominance": every pair of individuals, O(MN^2) with arrays, any quantity of objectives
+# "sweep": sweep line for one or two objectives, O(N log N)
+# "ens": efficient non-dominated sort with binary search for three objectives
+# "auto": the best one for the quantity of objectives and individuals
+STRATEGIES = ["auto", "dominance", "sweep", "ens"]
+
+# Below this quantity of individuals, the dominance matrix is faster than ENS (see benchmark.py)
+ENS_MIN_SIZE = 256
+
+def non_dominated_ranks(solutions, strategy="auto"):
+    '''Return the rank of each row of "solutions" using "strategy"'''
+
+    solutions = np.asarray(solutions, dtype=np.float64)
+    strategy = choose_strategy(solutions, strategy)
+
+    if strategy == "dominance":
+        return dominance_ranks(solutions)
+    if strategy == "sweep":
+        return sweep_ranks(solutions)
+
+    return ens_ranks(solutions)
+
+def non_dominated_fronts(solutions, strategy="auto"):
+    '''Yield the indexes of the rows of each front, from the first one, in the row order
+    With the dominance strategy each front is only peeled when it's asked for,
+    the others rank every row at once, in O(N log N)'''
+
+    solutions = np.asarray(solutions, dtype=np.float64)
+    strategy = choose_strategy(solutions, strategy)
+
+    if strategy == "dominance":
+        yield from dominance_fronts(solutions)
+        return
+
+    yield from fronts_of_ranks(non_dominated_ranks(solutions, strategy))
+
+def fronts_of_ranks(ranks):
+    '''Yield the indexes of the rows of each rank, from the first one, in the row order
+    Rows with rank 0 aren't ranked yet, so they're left out'''
+
+    order = np.argsort(ranks, kind="stable")
+    ends = np.cumsum(np.bincount(ranks)).tolist()
+
+    for start, end in zip(ends, ends[1:]):
+        yield order[start:end]
+
+def choose_strategy(solutions, strategy):
+    '''Return the strategy really used to sort "solutions", resolving "auto"'''
+
+    if solutions.ndim != 2:
+        raise ValueError("solutions must be a matrix, one row per individual")
+
+    objectives = solutions.shape[1]
+
+    if strategy == "auto":
+        if objectives <= 2:
+            return "sweep"
+        if objectives == 3 and solutions.shape[0] >= ENS_MIN_SIZE:
+            return "ens"
+        return "dominance"
+
+    if strategy not in STRATEGIES:
+        raise ValueError("unknown sorting strategy: " + str(strategy) + ". Use one of " + ", ".join(STRATEGIES))
+
+    return strategy
+
+def dominance_matrix(solutions):
+    '''Return a boolean matrix where [i, j] tells if the row "i" of "solutions" dominates the row "j"
+    Not worse in every objective, and better in at least one'''
+
+    size = solutions.shape[0]
+
+    not_worse = np.ones((size, size), dtype=bool)
+    better = np.zeros((size, size), dtype=bool)
+
+    # One objective at a time, so only (size x size) matrices are allocated
+    for objective in solutions.T:
+        not_worse &= objective[:, np.newaxis] <= objective[np.newaxis, :]
+        better |= objective[:, np.newaxis] < objective[np.newaxis, :]
+
+    return not_worse & better
+
+def dominance_ranks(solutions):
+    '''Deb's fast non-dominated sort over the whole dominance matrix'''
+
+    ranks = np.zeros(solutions.shape[0], dtype=np.int64)
+
+    for rank, front in enumerate(dominance_fronts(solutions), 1):
+        ranks[front] = rank
+
+    return ranks
+
+def dominance_fronts(solutions):
+    '''Yield the indexes of the rows of each front, peeled from the dominance matrix
+    The rows not dominated by anyone make the first front, and each front removed
+    decreases the domination count of the rows it dominates, making the next front
+    with the ones that reach zero. Nothing is peeled after the last front asked for'''
+
+    dominates = dominance_matrix(solutions)
+
+    # Quantity of rows which dominate each row
+    domination_count = dominates.sum(axis=0)
+
+    current_front = np.flatnonzero(domination_count == 0)
+
+    while current_front.size > 0:
+        yield current_front
+
+        # Removing the current front, so the rows dominated only by it reach zero
+        domination_count -= dominates[current_front].sum(axis=0)
+        domination_count[current_front] = -1
+
+        current_front = np.flatnonzero(domination_count == 0)
+
+def incremental_ranks(solutions, ranks):
+    '''Return the rank of each row of "solutions", where "ranks" already has the rank
+    of some rows among themselves, and 0 for the new rows
+
+    Only the new rows are inserted, one at a time: a binary search finds the first
+    front that doesn't dominate the row, and the row gets into it. The rows of that
+    front dominated by the new one go down one front, and so do the rows of the next
+    front dominated by them, and so on. So the old rows are never compared among
+    themselves. The ranks of the old rows must start from 1 with no gaps, like the
+    survivors of NSGA-II, which are whole fronts and a part of the last one'''
+
+    solutions = np.asarray(solutions, dtype=np.float64)
+    ranks = np.asarray(ranks, dtype=np.int64)
+
+    # Indexes of the rows of each front
+    fronts = [front.tolist() for front in fronts_of_ranks(ranks)]
+    new_rows = np.flatnonzero(ranks == 0).tolist()
+
+    for row in new_rows:
+        solution = solutions[row]
+
+        # Fronts dominating a row are always before the ones that don't
+        low = 0
+        high = len(fronts)
+        while low < high:
+            middle = (low + high) // 2
+            if _dominated(solutions[fronts[middle]], solution[np.newaxis, :]).any():
+                low = middle + 1
+            else:
+                high = middle
+
+        # Rows going down to the front "low"
+        moving = [row]
+        while moving:
+            if low == len(fronts):
+                fronts.append(moving)
+                break
+
+            front = fronts[low]
+            pushed = _dominated(solutions[moving], solutions[front])
+
+            fronts[low] = [index for index, down in zip(front, pushed.tolist()) if not down] + moving
+            moving = [index for index, down in zip(front, pushed.tolist()) if down]
+            low += 1
+
+    ranks = np.zeros(solutions.shape[0], dtype=np.int64)
+    for rank, front in enumerate(fronts, 1):
+        ranks[front] = rank
+
+    return ranks
+
+def _dominated(dominating, rows):
+    '''Tell, for each one of "rows", if some row of "dominating" dominates it'''
+
+    not_worse = (dominating[:, np.newaxis, :] <= rows[np.newaxis, :, :]).all(axis=2)
+    better = (dominating[:, np.newaxis, :] < rows[np.newaxis, :, :]).any(axis=2)
+
+    return (not_worse & better).any(axis=0)
+
+def sweep_ranks(solutions):
+    '''Sweep line over the rows sorted by the first and then the second objective
+    A row can only be dominated by the rows before it. In each front, the last row
+    inserted has the lowest second objective, so it's the only one that needs to be
+    checked, and those last rows are sorted along the fronts: a binary search finds
+    the first front that doesn't dominate the row'''
+
+    if solutions.shape[1] > 2:
+        raise ValueError("the sweep sorting is only for one or two objectives")
+
+    if solutions.shape[1] == 1:
+        solutions = np.column_stack((solutions[:, 0], np.zeros(solutions.shape[0])))
+
+    first = solutions[:, 0].tolist()
+    second = solutions[:, 1].tolist()
+
+    ranks = np.zeros(solutions.shape[0], dtype=np.int64)
+
+    # (second objective, first objective) of the last row of each front
+    last_rows = list()
+
+    for index in np.lexsort((solutions[:, 1], solutions[:, 0])).tolist():
+        # The last row of a front dominates this one when it's lower in this order,
+        # the same solutions don't dominate each other
+        key = (second[index], first[index])
+        front = bisect_left(last_rows, key)
+
+        if front == len(last_rows):
+            last_rows.append(key)
+        else:
+            last_rows[front] = key
+
+        ranks[index] = front + 1
+
+    return ranks
+
+def ens_ranks(solutions):
+    '''Efficient non-dominated sort (ENS-BS) for three objectives
+    The rows are sorted by the first objective, so a row can only be dominated by
+    the rows before it, and only the other two objectives need checking. Each front
+    keeps the staircase of those two objectives: the rows not dominated by another
+    row of the same front in them, sorted by the second objective. A row is dominated
+    by a front when the staircase step just before it is not above it, and a binary
+    search finds the first front that doesn't dominate the row'''
+
+    if solutions.shape[1] != 3:
+        raise ValueError("the ENS sorting is only for three objectives")
+
+    first = solutions[:, 0].tolist()
+    second = solutions[:, 1].tolist()
+    third = solutions[:, 2].tolist()
+
+    ranks = np.zeros(solutions.shape[0], dtype=np.int64)
+
+    # Staircase of each front, as lists of the second, third and first objectives
+    staircases = list()
+
+    for index in np.lexsort((solutions[:, 2], solutions[:, 1], solutions[:, 0])).tolist():
+        x, y, z = first[index], second[index], third[index]
+
+        # Fronts dominating a row are always before the ones that don't
+        low = 0
+        high = len(staircases)
+        while low < high:
+            middle = (low + high) // 2
+            if _staircase_dominates(staircases[middle], x, y, z):
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(staircases):
+            staircases.append((list(), list(), list()))
+        _staircase_insert(staircases[low], x, y, z)
+
+        ranks[index] = low + 1
+
+    return ranks
+
+def _staircase_dominates(staircase, x, y, z):
+    '''Tell if some row of "staircase", all of them with first objective up to "x", dominates (x, y, z)'''
+
+    steps_y, steps_z, steps_x = staircase
+
+    # The step with the highest second objective not above "y" has the lowest third one
+    position = bisect_right(steps_y, y) - 1
+    if position < 0:
+        return False
+
+    step_z = steps_z[position]
+    if step_z < z:
+        return True
+    if step_z > z:
+        return False
+
+    # Same third objective: equal rows don't dominate each other
+    return steps_y[position] < y or steps_x[position] < x
+
+def _staircase_insert(staircase, x, y, z):
+    '''Insert the row (x, y, z) in "staircase", dropping the steps it covers'''
+
+    steps_y, steps_z, steps_x = staircase
+
+    position = bisect_left(steps_y, y)
+
+    # A step before with a third objective not above "z" already covers this row
+    if position > 0 and steps_z[position-1] <= z:
+        return
+    if position < len(steps_y) and steps_y[position] == y and steps_z[position] <= z:
+        return
+
+    # Steps from here with third objective not below "z" are covered by this row
+    end = position
+    while end < len(steps_y) and steps_z[end] >= z:
+        end += 1
+
+    steps_y[position:end] = [y]
+    steps_z[position:end] = [z]
+    steps_x[position:end] = [x]
+
+class IncrementalFronts():
+    '''Fronts of a population that changes one individual at a time, like the steady-state NSGA-II
+
+    Each individual is a row, with its solutions, rank and crowding distance kept in
+    arrays. A row inserted goes to the first front that doesn't dominate it, pushing
+    down the rows it dominates, like incremental_ranks, and only the fronts changed get
+    their crowding distances calculated again'''
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+
+        # Allocated with the first solution, which tells the quantity of objectives
+        self.solutions = None
+        self.ranks = np.zeros(capacity, dtype=np.int64)
+        self.crowding_distances = np.zeros(capacity, dtype=np.float64)
+
+        # Rows of each front, from the first one, as arrays
+        self.fronts = list()
+
+    def insert(self, row, solution):
+        '''Put "row", with "solution", in its front'''
+
+        if self.solutions is None:
+            self.solutions = np.zeros((self.capacity, len(solution)), dtype=np.float64)
+
+        solutions = self.solutions
+        solutions[row] = solution
+        fronts = self.fronts
+
+        # Fronts dominating a row are always before the ones that don't
+        low = 0
+        high = len(fronts)
+        while low < high:
+            middle = (low + high) // 2
+            if _dominated(solutions[fronts[middle]], solutions[row:row+1]).any():
+                low = middle + 1
+            else:
+                high = middle
+
+        # Rows going down to the front "low"
+        moving = np.array([row], dtype=np.int64)
+        while moving.size > 0:
+            if low == len(fronts):
+                fronts.append(moving)
+                pushed_rows = moving[:0]
+            else:
+                front = fronts[low]
+                pushed = _dominated(solutions[moving], solutions[front])
+
+                fronts[low] = np.concatenate((front[~pushed], moving))
+                pushed_rows = front[pushed]
+
+            self.ranks[moving] = low + 1
+            self.update_crowding_distances(low)
+
+            moving = pushed_rows
+            low += 1
+
+    def remove_worst(self):
+        '''Take out of the fronts the row of the last front with the lowest crowding distance and return it
+        The last front doesn't dominate anyone, so no other rank changes'''
+
+        last_front = self.fronts[-1]
+        position = int(np.argmin(self.crowding_distances[last_front]))
+        worst = int(last_front[position])
+
+        self.fronts[-1] = np.delete(last_front, position)
+
+        if self.fronts[-1].size > 0:
+            self.update_crowding_distances(len(self.fronts) - 1)
+        else:
+            self.fronts.pop()
+
+        return worst
+
+    def move(self, source, destination):
+        '''Give the row "source" the number "destination", which must be out of the fronts'''
+
+        self.solutions[destination] = self.solutions[source]
+        self.ranks[destination] = self.ranks[source]
+        self.crowding_distances[destination] = self.crowding_distances[source]
+
+        front = self.fronts[self.ranks[source] - 1]
+        front[front == source] = destination
+
+    def update_crowding_distances(self, front_index):
+        '''Calculate again the crowding distances of the rows of a front'''
+
+        front = self.fronts[front_index]
+        self.crowding_distances[front] = crowding_distances(self.solutions[front])
+
+    def first_front(self):
+        '''Return the rows of the first front'''
+
+        return self.fronts[0].tolist() if self.fronts else list()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Stopping criteria of NSGA-II, checked after each generation besides the quantity of generations'''
+
+import time
+from collections import deque
+
+import numpy as np
+
+# Criteria that can stop a run. "generations" when every generation was run
+GENERATIONS = "generations"
+STAGNATION = "stagnation"
+HYPERVOLUME = "hypervolume"
+TIME_BUDGET = "time budget"
+EVALUATION_BUDGET = "evaluation budget"
+
+def hypervolume(solutions, reference_point):
+    '''Return the hypervolume dominated by the rows of "solutions" up to "reference_point",
+    all objectives minimized. Rows not better than the reference in every objective don't count
+
+    The rows are sorted by the last objective, and the volume is sliced along it: each
+    slice is the hypervolume of the rows up to it in the other objectives, so only the
+    last two objectives are swept directly'''
+
+    solutions = np.asarray(solutions, dtype=np.float64)
+    reference_point = np.asarray(reference_point, dtype=np.float64)
+
+    if solutions.size == 0:
+        return 0.0
+
+    solutions = solutions[(solutions < reference_point).all(axis=1)]
+
+    return _sliced_hypervolume(solutions, reference_point)
+
+def _sliced_hypervolume(solutions, reference_point):
+    '''Hypervolume of "solutions", all of them better than "reference_point"'''
+
+    if solutions.shape[0] == 0:
+        return 0.0
+
+    if solutions.shape[1] == 1:
+        return float(reference_point[0] - solutions[:, 0].min())
+
+    if solutions.shape[1] == 2:
+        # Sweep by the first objective, each row adds the area below the lowest second objective so far
+        volume = 0.0
+        lowest = reference_point[1]
+        order = np.lexsort((solutions[:, 1], solutions[:, 0]))
+        xs = solutions[order, 0].tolist() + [reference_point[0]]
+        ys = solutions[order, 1].tolist()
+        for i in range(len(ys)):
+            lowest = min(lowest, ys[i])
+            volume += (xs[i+1] - xs[i]) * (reference_point[1] - lowest)
+        return volume
+
+    solutions = solutions[np.argsort(solutions[:, -1], kind="stable")]
+    last = solutions[:, -1].tolist() + [reference_point[-1]]
+
+    volume = 0.0
+    for i in range(solutions.shape[0]):
+        if last[i+1] > last[i]:
+            volume += (last[i+1] - last[i]) * _sliced_hypervolume(solutions[:i+1, :-1], reference_point[:-1])
+
+    return volume
+
+class Termination():
+    '''Criteria that stop NSGA-II before its last generation
+
+    "stagnation": the key of the best front, like its set of quanta, didn't change for
+    this quantity of generations. "hypervolume_epsilon": the hypervolume of the best
+    front improved less than this over the last "hypervolume_window" generations. Both
+    fronts are measured against the same reference point: the bounds of the problem given
+    to "start", raised to the worst value of the two fronts if needed, and the objectives
+    are divided by it, so the reference point is 1 in every objective, like in the
+    experiments. "time_budget": seconds since the start of the run. "max_evaluations":
+    individuals evaluated. None disables a criterion'''
+
+    def __init__(self, stagnation=None, hypervolume_epsilon=None, hypervolume_window=5, time_budget=None, max_evaluations=None):
+        if hypervolume_window <= 0:
+            raise ValueError("hypervolume window must be greater than zero")
+
+        self.stagnation = stagnation
+        self.hypervolume_epsilon = hypervolume_epsilon
+        self.hypervolume_window = hypervolume_window
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+
+        self.start()
+
+    def start(self, reference_point=None):
+        '''Forget the previous run and start counting the time
+        "reference_point" bounds every objective, when it's known'''
+
+        self.start_time = time.time()
+
+        self.last_key = None
+        self.unchanged = 0
+
+        self.reference_point = None
+        if reference_point is not None:
+            self.reference_point = np.asarray(reference_point, dtype=np.float64)
+
+        # Best fronts of the last generations, the first one is compared with the current one
+        self.fronts = deque(maxlen=self.hypervolume_window + 1)
+
+    def check(self, evaluations, front_key, front_values):
+        '''Return the criterion that stops the run, or None to keep running
+        "front_values" are the objectives of the best front, one row per individual, not normalized'''
+
+        if self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            return EVALUATION_BUDGET
+
+        if self.time_budget is not None and time.time() - self.start_time >= self.time_budget:
+            return TIME_BUDGET
+
+        if self.stagnation is not None:
+            if front_key == self.last_key:
+                self.unchanged += 1
+            else:
+                self.last_key = front_key
+                self.unchanged = 0
+
+            if self.unchanged >= self.stagnation:
+                return STAGNATION
+
+        if self.hypervolume_epsilon is not None:
+            self.fronts.append(np.asarray(front_values, dtype=np.float64))
+
+            if len(self.fronts) > self.hypervolume_window:
+                if self.hypervolume_improvement(self.fronts[0], self.fronts[-1]) < self.hypervolume_epsilon:
+                    return HYPERVOLUME
+
+        return None
+
+    def hypervolume_improvement(self, old_front, new_front):
+        '''Return the hypervolume of "new_front" minus the one of "old_front", with the same reference point'''
+
+        # A bit above the worst value, so every individual of both fronts counts
+        worst = 1.1 * np.maximum(old_front.max(axis=0), new_front.max(axis=0))
+
+        if self.reference_point is None:
+            reference_point = worst
+        else:
+            reference_point = np.maximum(self.reference_point, worst)
+        reference_point[reference_point <= 0] = 1
+
+        ones = np.ones(len(reference_point))
+
+        return hypervolume(new_front / reference_point, ones) - hypervolume(old_front / reference_point, ones)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''Scaling benchmark of the Round Robin scheduling simulator
+
+Usage: python -m libraries.simulator.benchmark [options]
+
+For each size, a synthetic scenario is written and RoundRobinScheduler.run()
+is timed for each quantum. Each measure repeats run() until "min_time" seconds'''
+
+import argparse
+import sys
+import tempfile
+import time
+
+from .simulator import RoundRobinScheduler
+from .workload import WorkloadGenerator
+
+def benchmark(scenario, quanta, min_time=0.5, arrival_aware=False):
+    '''Return [quantum, evaluations, seconds, evaluations per second] for each quantum'''
+
+    round_robin = RoundRobinScheduler(scenario, arrival_aware=arrival_aware)
+
+    results = list()
+    for quantum in quanta:
+        evaluations = 0
+        start_time = time.perf_counter()
+        elapsed_time = 0
+
+        while evaluations == 0 or elapsed_time < min_time:
+            round_robin.run(quantum)
+            evaluations += 1
+            elapsed_time = time.perf_counter() - start_time
+
+        results.append([quantum, evaluations, elapsed_time, evaluations / elapsed_time])
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the round robin simulator")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**2, 10**3, 10**4, 10**5])
+    parser.add_argument("--quanta", type=int, nargs="+", default=[1, 10, 50, 300])
+    parser.add_argument("--bursts", choices=WorkloadGenerator.BURST_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--arrival", choices=WorkloadGenerator.ARRIVALS, default="zero")
+    parser.add_argument("--arrival-aware", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--folder", default=None, help="where the scenarios are written, a temporary folder by default")
+    args = parser.parse_args()
+
+    folder = args.folder
+    if folder is None:
+        folder = tempfile.mkdtemp(prefix="genetic-quantum-benchmark-")
+
+    generator = WorkloadGenerator(args.seed)
+
+    print("# Simulator benchmark")
+    print("# Bursts: " + args.bursts + "  Arrival: " + args.arrival + "  Arrival aware: " + str(args.arrival_aware)
+          + "  Seed: " + str(args.seed))
+    print("# [PROCESSES] [QUANTUM] [EVALUATIONS] [SECONDS] [EVALUATIONS PER SECOND]")
+
+    for process_quantity in args.sizes:
+        scenario = generator.write_scenarios(folder, [process_quantity], args.bursts, args.arrival)[0]
+
+        for quantum, evaluations, elapsed_time, evaluations_per_second in benchmark(scenario, args.quanta, args.min_time, args.arrival_aware):
+            print(str(process_quantity) + " " + str(quantum) + " " + str(evaluations) + " "
+                  + '%.4f'%(elapsed_time) + " " + '%.2f'%(evaluations_per_second))
+            sys.stdout.flush()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the binary scenario class
+
+Layout of a binary scenario, little endian:
+    [magic] [version] [reserved] [process quantity] [source size] [source mtime] [content hash]
+    padding up to HEADER_SIZE bytes
+    [identifiers] [arrival times] [burst times], each one with "process quantity" int64 values'''
+
+from hashlib import sha256
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from .processes import ProcessTable
+
+class BinaryScenario():
+    '''Compiled scenario file, read from memory without parsing'''
+
+    MAGIC = b"GQSCENAR"
+    VERSION = 1
+
+    HEADER = struct.Struct("<8sIIQQq32s")
+    HEADER_SIZE = 128
+
+    COLUMN_TYPE = np.dtype("<i8")
+
+    # Appended to the text scenario file name to get its compiled file name
+    EXTENSION = ".gqs"
+
+    @classmethod
+    def load(cls, file_name, verify=False):
+        '''Return the processes of "file_name", which may be a text or a binary scenario
+        A text scenario is compiled on the first use, and read from the compiled file
+        while the text file doesn't change. A compiled file with a damaged header or
+        the wrong size is compiled again. With "verify", so is one whose content hash
+        doesn't match, at the cost of reading the whole file'''
+
+        if cls.is_binary(file_name):
+            return cls.read(file_name, verify)
+
+        compiled_file_name = file_name + cls.EXTENSION
+        source = os.stat(file_name)
+
+        if os.path.exists(compiled_file_name):
+            header = cls.read_header(compiled_file_name)
+            if (header is not None and header["source_size"] == source.st_size
+                    and header["source_mtime"] == source.st_mtime_ns):
+                try:
+                    return cls.read(compiled_file_name, verify)
+                except ValueError:
+                    pass
+
+        processes = ProcessTable.read_text(file_name)
+
+        try:
+            cls.write(processes, compiled_file_name, source.st_size, source.st_mtime_ns)
+        except OSError:
+            # Without permission to write near the scenario, it's just parsed every time
+            return processes
+
+        return cls.read(compiled_file_name)
+
+    @classmethod
+    def compile(cls, file_name, compiled_file_name=None):
+        '''Convert the text scenario "file_name" into a binary scenario'''
+
+        if compiled_file_name is None:
+            compiled_file_name = file_name + cls.EXTENSION
+
+        source = os.stat(file_name)
+        cls.write(ProcessTable.read_text(file_name), compiled_file_name, source.st_size, source.st_mtime_ns)
+
+        return compiled_file_name
+
+    @classmethod
+    def write(cls, processes, file_name, source_size=0, source_mtime=0):
+        '''Write "processes" as a binary scenario
+        The file is written aside and then renamed, so readers never see it half written'''
+
+        columns = [np.ascontiguousarray(column, dtype=cls.COLUMN_TYPE)
+                   for column in (processes.identifiers, processes.arrival_times, processes.burst_times)]
+
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(processes),
+                                 source_size, source_mtime, cls.content_hash(columns))
+
+        temporary_file_name = file_name + "." + str(os.getpid()) + ".tmp"
+        try:
+            with open(temporary_file_name, "wb") as file_:
+                file_.write(header.ljust(cls.HEADER_SIZE, b"\0"))
+                for column in columns:
+                    file_.write(column.tobytes())
+            os.replace(temporary_file_name, file_name)
+        finally:
+            if os.path.exists(temporary_file_name):
+                os.remove(temporary_file_name)
+
+    @classmethod
+    def read(cls, file_name, verify=False):
+        '''Return the processes of a binary scenario
+        The columns point straight into the memory mapped file, nothing is copied
+        With "verify", the content hash of the header is checked'''
+
+        header = cls.read_header(file_name)
+        if header is None:
+            raise ValueError(str(file_name) + " isn't a binary scenario of version " + str(cls.VERSION))
+
+        process_quantity = header["process_quantity"]
+        column_size = process_quantity * cls.COLUMN_TYPE.itemsize
+
+        if os.path.getsize(file_name) != cls.HEADER_SIZE + 3 * column_size:
+            raise ValueError(str(file_name) + " is truncated")
+
+        with open(file_name, "rb") as file_:
+            mapped_file = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+
+        columns = [np.frombuffer(mapped_file, dtype=cls.COLUMN_TYPE, count=process_quantity,
+                                 offset=cls.HEADER_SIZE + i * column_size)
+                   for i in range(3)]
+
+        if verify and cls.content_hash(columns) != header["content_hash"]:
+            raise ValueError(str(file_name) + " is corrupted: its content hash doesn't match")
+
+        return ProcessTable(*columns)
+
+    @classmethod
+    def read_header(cls, file_name):
+        '''Return the header fields of a binary scenario, or None when it isn't one'''
+
+        with open(file_name, "rb") as file_:
+            data = file_.read(cls.HEADER.size)
+
+        if len(data) < cls.HEADER.size:
+            return None
+
+        magic, version, _, process_quantity, source_size, source_mtime, content_hash = cls.HEADER.unpack(data)
+
+        if magic != cls.MAGIC or version != cls.VERSION:
+            return None
+
+        return {"process_quantity": process_quantity,
+                "source_size": source_size,
+                "source_mtime": source_mtime,
+                "content_hash": content_hash}
+
+    @classmethod
+    def is_binary(cls, file_name):
+        '''Tell if "file_name" starts like a binary scenario'''
+
+        with open(file_name, "rb") as file_:
+            return file_.read(len(cls.MAGIC)) == cls.MAGIC
+
+    @staticmethod
+    def content_hash(columns):
+        '''Return the hash of the columns data'''
+
+        content = sha256()
+        for column in columns:
+            content.update(memoryview(column).cast('B'))
+
+        return content.digest()
+
+if __name__ == "__main__":
+    # Usage: python -m libraries.simulator.binary_scenario SCENARIO [COMPILED_SCENARIO]
+    if len(sys.argv) > 2:
+        print(BinaryScenario.compile(sys.argv[1], sys.argv[2]))
+    else:
+        print(BinaryScenario.compile(sys.argv[1]))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the simulation cache class'''
+
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+class CachedScheduler():
+    '''Memoization layer around a round robin scheduler
+
+    The metrics are stored by scenario fingerprint and effective quantum, so every
+    quantum in (k-1, k] is simulated only once. When "max_size" results are stored,
+    the least recently used one is discarded
+    It can be used by many threads: the stored results are locked, the simulations aren't'''
+
+    def __init__(self, scheduler, max_size=4096):
+        self.scheduler = scheduler
+        self.fingerprint = scheduler.fingerprint()
+
+        self.max_size = max_size
+
+        # (fingerprint, effective quantum) -> metrics, from the least to the most recently used
+        self.results = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.lock = threading.Lock()
+
+    def run(self, quantum):
+        '''Return the metrics of "quantum", simulating only when they aren't stored'''
+
+        key = (self.fingerprint, self.scheduler.effective_quantum(quantum))
+
+        with self.lock:
+            metrics = self.results.get(key)
+            if metrics is not None:
+                self.hits += 1
+                self.results.move_to_end(key)
+                return list(metrics)
+
+            self.misses += 1
+
+        metrics = self.scheduler.run(key[1])
+
+        with self.lock:
+            self.store(key, metrics)
+
+        return list(metrics)
+
+    def run_batch(self, quanta):
+        '''Return the metrics of each quantum in "quanta", simulating all the
+        missing ones in one call'''
+
+        keys = [(self.fingerprint, self.scheduler.effective_quantum(quantum)) for quantum in quanta]
+
+        # Metrics used by this batch, so it's complete even if it's bigger than the cache
+        batch_results = dict()
+        missing_quanta = list()
+
+        with self.lock:
+            for key in keys:
+                if key in batch_results:
+                    continue
+
+                metrics = self.results.get(key)
+                if metrics is None:
+                    missing_quanta.append(key[1])
+                    batch_results[key] = None
+                else:
+                    self.results.move_to_end(key)
+                    batch_results[key] = metrics
+
+            self.misses += len(missing_quanta)
+            self.hits += len(keys) - len(missing_quanta)
+
+        if missing_quanta:
+            missing_metrics = self.scheduler.run_batch(missing_quanta).tolist()
+
+            with self.lock:
+                for quantum, metrics in zip(missing_quanta, missing_metrics):
+                    key = (self.fingerprint, quantum)
+                    batch_results[key] = metrics
+                    self.store(key, metrics)
+
+        return np.array([batch_results[key] for key in keys], dtype=np.float64).reshape(-1, 3)
+
+    def store(self, key, metrics):
+        '''Store "metrics", discarding the least recently used ones when it's full
+        Must be called holding the lock'''
+
+        self.results[key] = tuple(metrics)
+        self.results.move_to_end(key)
+
+        while len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+    def hit_rate(self):
+        '''Return the fraction of the requested quanta that didn't need simulation'''
+
+        requests = self.hits + self.misses
+        if requests == 0:
+            return 0.0
+
+        return self.hits / requests
+
+    def clear(self):
+        '''Delete every stored result and reset the counters'''
+
+        with self.lock:
+            self.results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __str__(self):
+        return ("size=" + str(len(self.results))
+                + "  max_size=" + str(self.max_size)
+                + "  hits=" + str(self.hits)
+                + "  misses=" + str(self.misses)
+                + "  hit_rate=" + '%.2f'%(self.hit_rate()))
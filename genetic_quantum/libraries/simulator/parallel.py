@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the process pool scheduler class'''
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from .processes import ProcessTable
+
+# Scheduler of each worker process, created by _start_worker()
+_worker_scheduler = None
+# Shared memory block of each worker process, kept open while its columns are used
+_worker_memory = None
+
+def _start_worker(memory_name, process_quantity, scheduler_class, scenario, arrival_aware):
+    '''Create the scheduler of a worker process over the columns in shared memory'''
+
+    global _worker_scheduler, _worker_memory
+
+    # The block belongs to the main process, which is the only one that unlinks it
+    # Workers share its resource tracker, so attaching here doesn't register the block again
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+
+    columns = np.ndarray((3, process_quantity), dtype=np.int64, buffer=_worker_memory.buf)
+    columns.flags.writeable = False
+
+    processes = ProcessTable(columns[0], columns[1], columns[2])
+    _worker_scheduler = scheduler_class(scenario, arrival_aware=arrival_aware, processes=processes)
+
+def _run_chunk(quanta):
+    '''Evaluate one chunk of quanta in a worker process'''
+
+    return _worker_scheduler.run_batch(quanta)
+
+class ProcessPoolScheduler():
+    '''Evaluation backend that spreads the quanta over worker processes
+
+    The processes of the scenario are copied once into shared memory, where every
+    worker reads them, and the results come back in the same order of the quanta,
+    with the same values of "scheduler" alone'''
+
+    def __init__(self, scheduler, workers=None, chunk_size=None):
+        self.scheduler = scheduler
+
+        if workers is None:
+            workers = os.cpu_count()
+        self.workers = workers
+
+        # Quanta sent to a worker at once. By default, the quanta are split evenly among the workers
+        self.chunk_size = chunk_size
+
+        processes = scheduler.processes
+        process_quantity = len(processes)
+
+        self.memory = shared_memory.SharedMemory(create=True, size=max(3 * process_quantity * 8, 1))
+        columns = np.ndarray((3, process_quantity), dtype=np.int64, buffer=self.memory.buf)
+        columns[0] = processes.identifiers
+        columns[1] = processes.arrival_times
+        columns[2] = processes.burst_times
+        del columns
+
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_start_worker,
+                                            initargs=(self.memory.name, process_quantity, type(scheduler),
+                                                      scheduler.scenario, scheduler.arrival_aware))
+
+    def run(self, quantum):
+        '''Return the metrics of "quantum", evaluated by a worker'''
+
+        avg_turnaround_time, avg_waiting_time, context_switch = self.run_batch([quantum]).tolist()[0]
+
+        return list([avg_turnaround_time, avg_waiting_time, int(context_switch)])
+
+    def run_batch(self, quanta):
+        '''Return the metrics of each quantum in "quanta", evaluated in chunks by the workers'''
+
+        quanta = list(quanta)
+        if not quanta:
+            return np.empty((0, 3), dtype=np.float64)
+
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = -(-len(quanta) // self.workers)
+
+        chunks = [quanta[i:i+chunk_size] for i in range(0, len(quanta), chunk_size)]
+
+        return np.concatenate(list(self.executor.map(_run_chunk, chunks)))
+
+    def effective_quantum(self, quantum):
+        '''Return the quantum really used by the simulation'''
+
+        return self.scheduler.effective_quantum(quantum)
+
+    def fingerprint(self):
+        '''Return the fingerprint of the scenario'''
+
+        return self.scheduler.fingerprint()
+
+    def close(self):
+        '''Stop the workers and release the shared memory'''
+
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+            self.memory.close()
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the process table classes, used by Round Robin scheduling simulator'''
+
+from array import array
+import sys
+import tracemalloc
+
+import numpy as np
+
+# Process states
+READY = 0
+TERMINATED = 1
+
+class ProcessTable():
+    '''Processes of a scenario stored as columns, one position per process
+
+    The columns are read only, so the same table can be shared by every simulation'''
+
+    def __init__(self, identifiers, arrival_times, burst_times):
+        self.identifiers = self.column(identifiers)
+        self.arrival_times = self.column(arrival_times)
+        self.burst_times = self.column(burst_times)
+
+        self.size = len(self.identifiers)
+
+        if len(self.arrival_times) != self.size or len(self.burst_times) != self.size:
+            raise ValueError("every column must have one value per process")
+
+    @classmethod
+    def read_text(cls, file_name):
+        '''Return the processes of a scenario text file'''
+
+        identifiers = list()
+        arrival_times = list()
+        burst_times = list()
+
+        with open(file_name, 'r') as scenario_file:
+            for line in scenario_file:
+                # Ignoring commentaries and empty lines
+                if line.find('#') != -1 or line == "\n":
+                    continue
+
+                line = line.split(' ')
+
+                if line[0] == 'P':
+                    # P [identifier] [arrival time] [burst time]
+                    identifiers.append(int(line[1]))
+                    arrival_times.append(int(line[2]))
+                    burst_times.append(int(line[3]))
+
+        return cls(identifiers, arrival_times, burst_times)
+
+    @staticmethod
+    def column(values):
+        '''Return "values" as a read only column'''
+
+        # Already read only, like the memory mapped columns, so it's used without copy
+        if isinstance(values, np.ndarray) and values.dtype == np.int64 and not values.flags.writeable:
+            return values.reshape(-1)
+
+        column = np.array(values, dtype=np.int64).reshape(-1)
+        column.flags.writeable = False
+
+        return column
+
+    def new_state(self):
+        '''Return the scratch columns needed to simulate this table'''
+
+        return SimulationState(self)
+
+    def memory_usage(self):
+        '''Return the quantity of bytes used by the columns'''
+
+        return self.identifiers.nbytes + self.arrival_times.nbytes + self.burst_times.nbytes
+
+    def __len__(self):
+        return self.size
+
+class SimulationState():
+    '''Columns changed during one simulation of a process table
+
+    They are allocated once, and reset() puts them back to the beginning of a
+    simulation copying whole columns, without touching each process'''
+
+    def __init__(self, processes):
+        self.processes = processes
+        self.size = processes.size
+
+        # Initial values of the columns that start with zeros and READY
+        self.zeros = bytes(8 * self.size)
+        self.ready_states = bytes(self.size)
+
+        self.remaining_burst = array('q', self.zeros)
+        self.exit_time = array('q', self.zeros)
+        self.waiting_time = array('q', self.zeros)
+        # Moment each process last became READY
+        self.ready_since = array('q', self.zeros)
+        # READY or TERMINATED
+        self.state = array('b', self.ready_states)
+
+        self.reset()
+
+    @staticmethod
+    def fill(column, values):
+        '''Overwrite the whole "column" with the bytes of "values"'''
+
+        memoryview(column).cast('B')[:] = memoryview(values).cast('B')
+
+    def reset(self, arrival_aware=False):
+        '''Prepare the columns for a new simulation
+        With "arrival_aware" each process becomes READY at its arrival time, otherwise at time zero'''
+
+        self.fill(self.remaining_burst, self.processes.burst_times)
+        self.fill(self.exit_time, self.zeros)
+        self.fill(self.waiting_time, self.zeros)
+        self.fill(self.state, self.ready_states)
+
+        if arrival_aware:
+            self.fill(self.ready_since, self.processes.arrival_times)
+        else:
+            self.fill(self.ready_since, self.zeros)
+
+    def memory_usage(self):
+        '''Return the quantity of bytes used by the columns'''
+
+        columns = (self.remaining_burst, self.exit_time, self.waiting_time, self.ready_since, self.state)
+
+        return (len(self.zeros) + len(self.ready_states)
+                + sum(column.itemsize * len(column) for column in columns))
+
+class Process():
+    '''Process as one object, with the same data of one position of a process table
+    Only used to show a process and to compare the memory usage'''
+
+    def __init__(self, identifier=None, arrival_time=None, burst_time=None):
+        self.identifier = identifier
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+
+        self.remaining_burst = self.burst_time
+
+        self.exit_time = 0
+
+        self.turnaround_time = 0
+        self.waiting_time = 0
+
+        # READY or TERMINATED (R or T)
+        self.state = "R"
+
+    def __str__(self):
+        result = ("id=" + str(self.identifier)
+                + "  arrival=" + str(self.arrival_time)
+                + "  burst=" + str(self.burst_time)
+                + "  remaining_burst=" + str(self.remaining_burst)
+                + "  turnaround_time=" + str(self.turnaround_time)
+                + "  waiting_time=" + str(self.waiting_time)
+                + "  state=" + str(self.state))
+        return result
+
+def memory_report(process_quantity):
+    '''Compare the memory used by "process_quantity" processes as Process objects
+    and as a process table with its simulation state'''
+
+    identifiers = range(1, process_quantity + 1)
+    arrival_times = range(0, process_quantity)
+    burst_times = range(process_quantity, 0, -1)
+
+    tracemalloc.start()
+    processes = [Process(identifier, arrival_time, burst_time)
+                 for identifier, arrival_time, burst_time in zip(identifiers, arrival_times, burst_times)]
+    objects_memory = tracemalloc.get_traced_memory()[0]
+    del processes
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = ProcessTable(identifiers, arrival_times, burst_times)
+    state = table.new_state()
+    table_memory = tracemalloc.get_traced_memory()[0]
+    del table, state
+    tracemalloc.stop()
+
+    result = "# Memory used by " + str(process_quantity) + " processes\n"
+    result += "Process objects: " + '%.2f'%(objects_memory / 2**20) + " MiB\n"
+    result += "Process table:   " + '%.2f'%(table_memory / 2**20) + " MiB\n"
+    result += "Saving:          " + '%.1f'%(objects_memory / max(table_memory, 1)) + "x\n"
+
+    return result
+
+if __name__ == "__main__":
+    # Usage: python -m libraries.simulator.processes [PROCESS_QUANTITY]
+    if len(sys.argv) > 1:
+        print(memory_report(int(sys.argv[1])))
+    else:
+        print(memory_report(1000000))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the trace recorder, which keeps the events of a simulation
+
+Usage: python -m libraries.simulator.recorder SCENARIO QUANTUM GANTT_FILE [--arrival-aware] [--capacity N]'''
+
+import argparse
+
+import numpy as np
+
+# Events of a simulation
+DISPATCH = 0
+PREEMPT = 1
+EXIT = 2
+
+EVENT_NAMES = ["DISPATCH", "PREEMPT", "EXIT"]
+
+class TraceRecorder():
+    '''Events of a simulation stored in a ring buffer
+
+    The buffer is a record array allocated only once, holding the last "capacity"
+    events. Nothing is recorded unless a recorder is given to RoundRobinScheduler.run'''
+
+    EVENT_TYPE = np.dtype([("time", np.int64), ("event", np.int8),
+                           ("process", np.int64), ("remaining_burst", np.int64)])
+
+    def __init__(self, capacity=65536):
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than zero")
+
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=self.EVENT_TYPE)
+
+        # Quantity of events recorded since the last clear, including the overwritten ones
+        self.recorded = 0
+
+    def record(self, time, event, process, remaining_burst):
+        '''Store an event, overwriting the oldest one when the buffer is full'''
+
+        self.buffer[self.recorded % self.capacity] = (time, event, process, remaining_burst)
+        self.recorded += 1
+
+    def events(self):
+        '''Return the events kept in the buffer, from the oldest to the newest'''
+
+        if self.recorded <= self.capacity:
+            return self.buffer[:self.recorded].copy()
+
+        position = self.recorded % self.capacity
+        return np.concatenate((self.buffer[position:], self.buffer[:position]))
+
+    def lost(self):
+        '''Return the quantity of events overwritten because the buffer was full'''
+
+        return max(self.recorded - self.capacity, 0)
+
+    def clear(self):
+        '''Forget every event, keeping the buffer'''
+
+        self.recorded = 0
+
+    def gantt(self):
+        '''Return the time slices of the events kept, as (process, start, end, event) tuples
+        Each slice goes from a dispatch to the preemption or exit of the same process'''
+
+        slices = list()
+        dispatch = None
+
+        for time, event, process, _ in self.events().tolist():
+            if event == DISPATCH:
+                dispatch = (process, time)
+            elif dispatch is not None and dispatch[0] == process:
+                slices.append((process, dispatch[1], time, EVENT_NAMES[event]))
+                dispatch = None
+
+        return slices
+
+    def write_gantt(self, file_name):
+        '''Write the time slices into "file_name", one per line'''
+
+        with open(file_name, "w") as file_:
+            file_.write("# [PROCESS] [START] [END] [EVENT]\n")
+            if self.lost():
+                file_.write("# " + str(self.lost()) + " events before these were overwritten\n")
+
+            for process, start, end, event in self.gantt():
+                file_.write(str(process) + " " + str(start) + " " + str(end) + " " + event + "\n")
+
+    def __len__(self):
+        return min(self.recorded, self.capacity)
+
+    def __str__(self):
+        return ("capacity=" + str(self.capacity)
+                + "  recorded=" + str(self.recorded)
+                + "  lost=" + str(self.lost()))
+
+if __name__ == "__main__":
+    from .simulator import RoundRobinScheduler
+
+    parser = argparse.ArgumentParser(description="Simulate a scenario and write its Gantt chart events")
+    parser.add_argument("scenario")
+    parser.add_argument("quantum", type=float)
+    parser.add_argument("gantt_file")
+    parser.add_argument("--arrival-aware", action="store_true")
+    parser.add_argument("--capacity", type=int, default=65536)
+    args = parser.parse_args()
+
+    recorder = TraceRecorder(args.capacity)
+    metrics = RoundRobinScheduler(args.scenario, arrival_aware=args.arrival_aware).run(args.quantum, recorder=recorder)
+    recorder.write_gantt(args.gantt_file)
+
+    print("# [TURNAROUND TIME] [WAITING TIME] [CONTEXT SWITCHES]")
+    print(str(metrics[0]) + " " + str(metrics[1]) + " " + str(metrics[2]))
+    print("# " + str(recorder))
@@ -12,190 +12,469 @@
 
 '''File of Round Robin simulator class'''
 
+from collections import deque
+from hashlib import sha256
+from heapq import heapify, heappop
+from math import ceil, log2
+import threading
+
+import numpy as np
+
+from .binary_scenario import BinaryScenario
+from .processes import TERMINATED
+from .recorder import DISPATCH, PREEMPT, EXIT
+
+# Elements of each matrix of run_batch, one process per row and one quantum per column.
+# About 8 MB per matrix; the quanta are simulated in chunks that fit in it
+BATCH_ELEMENTS = 2**20
+
+# Cost of one step of the closed form, per process and per log2 of the process quantity,
+# measured against one process of one round of the array simulation (see run_batch)
+CLOSED_FORM_COST = 8
+
+def simulate_slices(quantum, remaining_burst, waiting_time, ready_since, exit_time,
+                    ready_queue, pending_arrivals, current_time=0, until=None, on_slice=None):
+    '''Run the time slices of the Round Robin scheduling, changing the columns and the queues
+
+    The processes are keys of the columns. "ready_queue" is a deque of the READY ones,
+    and "pending_arrivals" a heap of the ones not arrived yet, as tuples starting with
+    the arrival time and ending with the process. Each dispatch runs a whole time slice
+    at once: min(quantum, remaining burst), and the waiting time of a process is
+    accounted only when it's dispatched, from the moment it last became READY. When
+    nothing is READY the time jumps straight to the next arrival
+    The slices go on while the time is lower than "until", or until every process
+    finishes when it's None. A time slice is never interrupted, so the time may end a
+    bit after "until". "on_slice", when given, is called after each slice with the
+    process, the time it was dispatched and the time the slice ended
+    Return the time, the quantity of dispatches, the processes finished, in the order
+    they finished, and the process preempted by the last slice, if any'''
+
+    recording = on_slice is not None
+
+    finished = list()
+    dispatches = 0
+    preempted = None
+
+    while (ready_queue or pending_arrivals) and (until is None or current_time < until):
+        if not ready_queue:
+            # Nothing to run: jumping the idle time until the next arrival
+            if pending_arrivals[0][0] > current_time:
+                # The next arrival is after "until", so the time stays before the processes admitted later
+                if until is not None and pending_arrivals[0][0] >= until:
+                    break
+                current_time = pending_arrivals[0][0]
+
+            while pending_arrivals and pending_arrivals[0][0] <= current_time:
+                ready_queue.append(heappop(pending_arrivals)[-1])
+
+        process = ready_queue.popleft()
+
+        dispatches += 1
+
+        # Time spent on the queue since the last time this process was READY
+        waiting_time[process] += current_time - ready_since[process]
+
+        start_time = current_time
+        time_slice = min(quantum, remaining_burst[process])
+        current_time += time_slice
+        remaining_burst[process] -= time_slice
+
+        # Storing the current time as exit time
+        exit_time[process] = current_time
+
+        # Processes that arrived during this slice get in the queue before the current one
+        while pending_arrivals and pending_arrivals[0][0] <= current_time:
+            ready_queue.append(heappop(pending_arrivals)[-1])
+
+        # Not finished yet: back to the end of the queue
+        if remaining_burst[process] > 0:
+            ready_since[process] = current_time
+            ready_queue.append(process)
+            preempted = process
+        else:
+            finished.append(process)
+            preempted = None
+
+        if recording:
+            on_slice(process, start_time, current_time)
+
+    return current_time, dispatches, finished, preempted
+
 class RoundRobinScheduler():
-    '''Round Robin scheduling simulator'''
+    '''Round Robin scheduling simulator
+
+    By default every process is READY from the beginning and the arrival time is
+    only used in the turnaround time. With "arrival_aware", each process only
+    becomes READY at its arrival time
 
-    def __init__(self, scenario, debug=None):
+    The scenario is read only and each simulation keeps its state apart, in the
+    columns of its own thread, so the same scheduler can be used by many threads'''
+
+    def __init__(self, scenario, debug=None, arrival_aware=False, processes=None):
         if debug:
             self.debug = debug
         else:
             self.debug = False
 
+        self.arrival_aware = arrival_aware
+
         self.scenario = scenario
-        self.processes = list()
+        self.processes = processes
         self.process_quantity = 0
-        self.get_processes()
 
-    def run(self, quantum):
-        '''Simulate the round robin scheduling'''
+        # The processes may be already loaded, otherwise they're read from the scenario file
+        if self.processes is None:
+            self.get_processes()
+        else:
+            self.process_quantity = len(self.processes)
+
+        # Columns changed by each simulation, allocated only once per thread
+        self.local = threading.local()
+
+    def run(self, quantum, state=None, recorder=None):
+        '''Simulate the round robin scheduling
+
+        READY processes wait in a circular queue and the ones not arrived yet in a heap
+        ordered by arrival time, see simulate_slices
+        "state" holds the columns changed by the simulation; by default, the ones of the current thread
+        "recorder" is a TraceRecorder that gets every dispatch, preemption and exit'''
+
+        debug = self.debug
+
+        quantum = self.effective_quantum(quantum)
 
         # Resulting metrics
         avg_turnaround_time = None
         avg_waiting_time = None
         context_switch = -1
 
-        current_time = 0
-        process_index = -1
-        process_index = self.get_next_process_index(process_index)
-
-        while process_index is not None:
-            if self.debug == True: print("\ncurrent_time:", current_time)
-
-            context_switch += 1
+        # The scenario itself is never modified, only the simulation state columns
+        if state is None:
+            state = self.get_state()
+        state.reset(self.arrival_aware)
 
-            remaining_time = quantum
-            others_waiting_time = 0
+        exit_time = state.exit_time
+        waiting_time = state.waiting_time
 
-            while self.processes[process_index].remaining_burst > 0 and remaining_time > 0:
-                self.processes[process_index].consume_time_unit()
-                current_time += 1
-                remaining_time -= 1
-                others_waiting_time += 1
+        if self.arrival_aware:
+            ready_queue = deque()
 
-            # Storing the current time as exit time
-            self.processes[process_index].exit_time = current_time
+            # Processes not arrived yet, by arrival time and then by scenario order
+            pending_arrivals = list(zip(self.processes.arrival_times.tolist(), range(self.process_quantity)))
+            heapify(pending_arrivals)
+        else:
+            # Every process is READY at the beginning, in the scenario order
+            ready_queue = deque(range(self.process_quantity))
 
-            # Incrementing the waiting time of all other processes that are waiting right now
-            self.increment_waiting_time(others_waiting_time, process_index)
+            pending_arrivals = list()
 
-            if self.debug == True: print(self.processes[process_index])
+        # Without recording, nothing is called after each slice
+        on_slice = None
+        if debug or recorder is not None:
+            on_slice = self._slice_hook(state, recorder)
 
-            process_index = self.get_next_process_index(process_index)
+        current_time, dispatches, finished, _ = simulate_slices(
+            quantum, state.remaining_burst, waiting_time, state.ready_since, exit_time,
+            ready_queue, pending_arrivals, on_slice=on_slice)
+        context_switch += dispatches
 
-        if self.debug == True: print("\ncurrent_time:", current_time, "\nEnd of simulation.")
+        process_state = state.state
+        for process_index in finished:
+            process_state[process_index] = TERMINATED
 
-        total_turnaround_time = 0
-        total_waiting_time = 0
+        if debug: print("\ncurrent_time:", current_time, "\nEnd of simulation.")
 
         # Calculating the turnaround time of each process and the average
         # Also, calculating the average waiting time
-        for process in self.processes:
-            process.turnaround_time = process.exit_time - process.arrival_time
-            total_turnaround_time += process.turnaround_time
-            total_waiting_time += process.waiting_time
-            if self.debug == True: print(process)
+        total_turnaround_time = sum(exit_time) - int(self.processes.arrival_times.sum())
+        total_waiting_time = sum(waiting_time)
+
+        if debug:
+            for process_index in range(self.process_quantity):
+                print(self._process_status(process_index, state))
 
         avg_turnaround_time = total_turnaround_time / self.process_quantity
         avg_waiting_time = total_waiting_time / self.process_quantity
 
-        # Reseting the processes for the possible next simulation
-        self.reset_processes()
-
-        if self.debug == True: print("avg_turnaround_time:", avg_turnaround_time)
-        if self.debug == True: print("avg_waiting_time:", avg_waiting_time)
-        if self.debug == True: print("context_switch:", context_switch)
+        if debug: print("avg_turnaround_time:", avg_turnaround_time)
+        if debug: print("avg_waiting_time:", avg_waiting_time)
+        if debug: print("context_switch:", context_switch)
 
         resulting_metrics = list([avg_turnaround_time, avg_waiting_time, context_switch])
         #resulting_metrics = list([avg_turnaround_time, avg_waiting_time])
         return resulting_metrics
 
+    def _slice_hook(self, state, recorder):
+        '''Return what is called after each slice to give its events to "recorder",
+        when there's one, and to show the process dispatched when debugging'''
+
+        debug = self.debug
+
+        identifiers = self.processes.identifiers.tolist()
+        remaining_burst = state.remaining_burst
+        process_state = state.state
+
+        def on_slice(process_index, start_time, end_time):
+            if debug: print("\ncurrent_time:", start_time)
+
+            remaining = remaining_burst[process_index]
+            if remaining == 0:
+                process_state[process_index] = TERMINATED
+
+            if recorder is not None:
+                recorder.record(start_time, DISPATCH, identifiers[process_index], remaining + end_time - start_time)
+                recorder.record(end_time, PREEMPT if remaining > 0 else EXIT, identifiers[process_index], remaining)
+
+            if debug: print(self._process_status(process_index, state))
+
+        return on_slice
+
+    def run_batch(self, quanta):
+        '''Simulate the round robin scheduling for several quanta at once
+        Return an array with one row per quantum, holding the same metrics as run()
+
+        Every process is READY from the beginning, so the scheduling is a sequence of
+        rounds where each unfinished process gets one slice in the scenario order. Each
+        round is computed for all processes and all quanta with array operations
+        The quanta are simulated in chunks, so each matrix has at most BATCH_ELEMENTS
+        elements; when not even one quantum fits, each one is simulated by run()
+        With "arrival_aware" there are no such rounds, so each quantum is simulated by run()'''
+
+        if self.arrival_aware:
+            return np.array([self.run(quantum) for quantum in quanta], dtype=np.float64).reshape(-1, 3)
+
+        # Time only advances in whole units, so every quantum in (k-1, k] behaves as k
+        quanta = np.ceil(np.asarray(quanta, dtype=np.float64)).astype(np.int64)
+        if quanta.size > 0 and quanta.min() <= 0:
+            raise ValueError("quantum must be greater than zero")
+
+        # Each different quantum is simulated only once, from the lowest to the highest
+        unique_quanta, quanta_index = np.unique(quanta, return_inverse=True)
+
+        resulting_metrics = np.empty((unique_quanta.size, 3), dtype=np.float64)
+
+        chunk_size = BATCH_ELEMENTS // max(self.process_quantity, 1)
+        if chunk_size == 0:
+            for i, quantum in enumerate(unique_quanta.tolist()):
+                resulting_metrics[i] = self.run(quantum)
+        else:
+            for start in range(0, unique_quanta.size, chunk_size):
+                resulting_metrics[start:start+chunk_size] = self._run_rounds(unique_quanta[start:start+chunk_size])
+
+        return resulting_metrics[quanta_index.reshape(-1)]
+
+    def _run_rounds(self, unique_quanta):
+        '''Simulate the rounds of the sorted, different quanta "unique_quanta" at once
+        Return an array with one row of metrics per quantum'''
+
+        burst_times = self.processes.burst_times
+
+        # Quantity of slices each process needs to finish, for each quantum
+        process_rounds = -(-burst_times[:, np.newaxis] // unique_quanta)
+        rounds = process_rounds.max(axis=0, initial=0)
+        context_switch = process_rounds.sum(axis=0) - 1
+
+        # One row per process, one column per quantum
+        remaining_burst = np.repeat(burst_times[:, np.newaxis], unique_quanta.size, axis=1)
+        current_time = np.zeros(unique_quanta.size, dtype=np.int64)
+        total_exit_time = np.zeros(unique_quanta.size, dtype=np.int64)
+
+        for round_index in range(rounds.max(initial=0)):
+            # Higher quanta need fewer rounds, so the unfinished simulations are always the first columns
+            active = np.count_nonzero(rounds > round_index)
+
+            time_slice = np.minimum(remaining_burst[:, :active], unique_quanta[:active])
+            exit_time = current_time[:active] + np.cumsum(time_slice, axis=0)
+            remaining_burst[:, :active] -= time_slice
+
+            # Processes that used their last slice in this round
+            finished = (time_slice > 0) & (remaining_burst[:, :active] == 0)
+            total_exit_time[:active] += np.where(finished, exit_time, 0).sum(axis=0)
+
+            current_time[:active] = exit_time[-1]
+
+        total_turnaround_time = total_exit_time - self.processes.arrival_times.sum()
+        # Waiting all the time between the beginning and the exit, except when running
+        total_waiting_time = total_exit_time - burst_times.sum()
+
+        resulting_metrics = np.empty((unique_quanta.size, 3), dtype=np.float64)
+        resulting_metrics[:, 0] = total_turnaround_time / self.process_quantity
+        resulting_metrics[:, 1] = total_waiting_time / self.process_quantity
+        resulting_metrics[:, 2] = context_switch
+
+        return resulting_metrics
+
     def get_processes(self):
-        '''Get processes data from scenario file'''
+        '''Get processes data from scenario file
+        The text file is compiled into a binary file on the first use, so the next
+        ones just map it into memory'''
 
-        scenario_file = open(self.scenario, 'r')
-        lines = scenario_file.readlines()
+        self.processes = BinaryScenario.load(self.scenario)
+        self.process_quantity = len(self.processes)
 
-        for line in lines:
-            # Ignoring commentaries and empty lines
-            if line.find('#') != -1 or line == "\n":
-                continue
+    def get_state(self):
+        '''Return the simulation state columns of the current thread, allocated on its first simulation'''
 
-            line = line.split(' ')
+        state = getattr(self.local, "state", None)
 
-            if line[0] == 'P':
-                # P [identifier] [arrival time] [burst time]
-                process = Process(int(line[1]), int(line[2]), int(line[3]))
-                self.processes.append(process)
-                self.process_quantity += 1
+        if state is None:
+            state = self.processes.new_state()
+            self.local.state = state
 
-    def reset_processes(self):
-        ''' Reset the values inserted in each process of current scenario'''
+        return state
 
-        for process in self.processes:
-            process.reset()
+    @staticmethod
+    def effective_quantum(quantum):
+        '''Return the quantum really used by the simulation
+        Time only advances in whole units, so every quantum in (k-1, k] behaves as k'''
 
-    def get_next_process_index(self, last_process_id):
-        '''Return the next READY process in the processes list
-        Return None when there's no avaliable READY process'''
+        quantum = ceil(quantum)
+        if quantum <= 0:
+            raise ValueError("quantum must be greater than zero")
 
-        process_quantity = self.process_quantity
+        return quantum
+
+    def fingerprint(self):
+        '''Return a hash of everything in the scenario that changes the metrics'''
 
-        for i in range(last_process_id+1, process_quantity):
-            if self.processes[i].state == "R":
-                return i
+        content = sha256()
+        content.update(self.processes.arrival_times.tobytes())
+        content.update(self.processes.burst_times.tobytes())
 
-        for i in range(0, last_process_id+1):
-            if self.processes[i].state == "R":
-                return i
+        # The same scenario has other metrics when the arrival time is respected
+        if self.arrival_aware:
+            content.update(b"arrival-aware")
 
-        return None
+        return content.hexdigest()
 
-    def increment_waiting_time(self, time, current_process_index):
-        '''Increment the "time" value to all READY process wainting time
-        The process with id equals to "current_process_index" is ignored'''
+    def zero_arrival_time(self):
+        '''Return True when every process of the scenario arrives at time zero'''
 
-        for process in self.processes:
-            if process.identifier != self.processes[current_process_index].identifier:
-                if process.state == "R":
-                    process.waiting_time += time
+        return not self.processes.arrival_times.any()
 
     def worst_metrics(self):
         ''' Return the worst metrics. This is used as reference point in the
         hypervolume indicator calculation'''
 
-        burst_summation = 0
-        for process in self.processes:
-            burst_summation += process.burst_time
-
-        highest_burst = 0
-        for process in self.processes:
-            if process.burst_time > highest_burst:
-                highest_burst = process.burst_time
+        burst_summation = int(self.processes.burst_times.sum())
+        highest_burst = int(self.processes.burst_times.max(initial=0))
 
         # [worst turaround time, worst waiting time, worst context switches]
         return [burst_summation, highest_burst, burst_summation]
 
-class Process():
-    '''Process class; used by Round Robin scheduling simulator'''
+    def _process_status(self, process_index, state):
+        '''Return the state of the process in the simulation using "state"'''
+
+        processes = self.processes
 
-    def __init__(self, identifier=None, arrival_time=None, burst_time=None):
-        self.identifier = identifier
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
+        if state.state[process_index] == TERMINATED:
+            state_name = "T"
+        else:
+            state_name = "R"
+
+        result = ("id=" + str(processes.identifiers[process_index])
+                + "  arrival=" + str(processes.arrival_times[process_index])
+                + "  burst=" + str(processes.burst_times[process_index])
+                + "  remaining_burst=" + str(state.remaining_burst[process_index])
+                + "  turnaround_time=" + str(state.exit_time[process_index] - processes.arrival_times[process_index])
+                + "  waiting_time=" + str(state.waiting_time[process_index])
+                + "  state=" + state_name)
+        return result
 
-        self.remaining_burst = self.burst_time
+class ZeroArrivalRoundRobinScheduler(RoundRobinScheduler):
+    '''Round Robin scheduling without simulation, for scenarios where every
+    process arrives at time zero
 
-        self.exit_time = 0
+    In that case the scheduling is a sequence of rounds, one slice per unfinished
+    process in the scenario order, and process "i" finishes on round
+    ceil(burst_i / quantum). For every pair of processes, the one that finishes first
+    (fewer rounds, or the same rounds and first in the scenario order) adds its whole
+    burst to the exit time of the other, and the other adds one quantum for each round
+    it was served before that, which is one more round when it comes first in the
+    scenario order. So the metrics only need a sort and an inversion count'''
 
-        self.turnaround_time = 0
-        self.waiting_time = 0
+    def __init__(self, scenario, debug=None, arrival_aware=False, processes=None):
+        # Calling the parent constructor
+        super().__init__(scenario, debug, arrival_aware, processes)
 
-        # READY or TERMINATED (R or T)
-        self.state = "R"
+        if not self.zero_arrival_time():
+            raise ValueError("every process must arrive at time zero: " + str(scenario))
 
-    def consume_time_unit(self):
-        '''Decreases one time unit from process remaining burst time
-        When there's no more remaining burst, change state to TERMINATED'''
+        # Read many times per evaluation, so kept as a list
+        self.burst_times = self.processes.burst_times.tolist()
+        self.burst_summation = sum(self.burst_times)
 
-        self.remaining_burst -= 1
-        if self.remaining_burst == 0:
-            self.state = "T"
+    def run(self, quantum, state=None, recorder=None):
+        '''Calculate the round robin scheduling metrics
+        Nothing is simulated, so "state" isn't used, unless there's a "recorder" to get the events'''
 
-    def reset(self):
-        '''Reset the process values so it can be used in the simulation'''
+        if recorder is not None:
+            return super().run(quantum, state, recorder)
 
-        self.remaining_burst = self.burst_time
-        self.exit_time = 0
-        self.turnaround_time = 0
-        self.waiting_time = 0
-        self.state = "R"
+        quantum = self.effective_quantum(quantum)
 
-    def __str__(self):
-        result = ("id=" + str(self.identifier)
-                + "  arrival=" + str(self.arrival_time)
-                + "  burst=" + str(self.burst_time)
-                + "  remaining_burst=" + str(self.remaining_burst)
-                + "  turnaround_time=" + str(self.turnaround_time)
-                + "  waiting_time=" + str(self.waiting_time)
-                + "  state=" + str(self.state))
-        return result
+        burst_times = self.burst_times
+        process_quantity = self.process_quantity
+
+        # Quantity of slices (rounds) each process needs to finish
+        rounds = [(burst_time + quantum - 1) // quantum for burst_time in burst_times]
+
+        # Sorting is stable, so processes with the same rounds stay in the scenario order
+        completion_order = sorted(range(process_quantity), key=rounds.__getitem__)
+
+        total_exit_time = self.burst_summation
+
+        # Fenwick tree over the scenario order, counting the processes already finished
+        finished = [0] * (process_quantity + 1)
+        # Pairs where the process that finishes later comes first in the scenario order
+        inversions = 0
+
+        for position, process_index in enumerate(completion_order):
+            # This process delays every process that finishes after it
+            later_processes = process_quantity - 1 - position
+            total_exit_time += later_processes * (burst_times[process_index] + quantum * (rounds[process_index] - 1))
+
+            i = process_index + 1
+            finished_before = 0
+            while i > 0:
+                finished_before += finished[i]
+                i -= i & -i
+            inversions += position - finished_before
+
+            i = process_index + 1
+            while i <= process_quantity:
+                finished[i] += 1
+                i += i & -i
+
+        total_exit_time += quantum * inversions
+
+        avg_turnaround_time = total_exit_time / process_quantity
+        avg_waiting_time = (total_exit_time - self.burst_summation) / process_quantity
+        context_switch = sum(rounds) - 1
+
+        if self.debug == True: print("avg_turnaround_time:", avg_turnaround_time)
+        if self.debug == True: print("avg_waiting_time:", avg_waiting_time)
+        if self.debug == True: print("context_switch:", context_switch)
+
+        return list([avg_turnaround_time, avg_waiting_time, context_switch])
+
+    def run_batch(self, quanta):
+        '''Calculate the round robin scheduling metrics for several quanta at once
+        The rounds of the parent cost one step per process and round of each quantum,
+        and the closed form about CLOSED_FORM_COST * log2(processes) steps per process.
+        So small quanta and long bursts, which need many rounds, use the closed form'''
+
+        quanta = np.ceil(np.asarray(quanta, dtype=np.float64)).astype(np.int64)
+        if quanta.size > 0 and quanta.min() <= 0:
+            raise ValueError("quantum must be greater than zero")
+
+        unique_quanta, quanta_index = np.unique(quanta, return_inverse=True)
+
+        rounds = int((-(-self.processes.burst_times.max(initial=0) // unique_quanta)).sum())
+        if rounds <= CLOSED_FORM_COST * unique_quanta.size * log2(self.process_quantity + 1):
+            return super().run_batch(quanta)
+
+        resulting_metrics = np.array([self.run(quantum) for quantum in unique_quanta.tolist()],
+                                     dtype=np.float64).reshape(-1, 3)
+
+        return resulting_metrics[quanta_index.reshape(-1)]
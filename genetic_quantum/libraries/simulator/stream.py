@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the streaming Round Robin simulator, used to replay long arrival traces
+
+A trace is a scenario with the processes in arrival order. It's read window by
+window, so only the processes of the current window and the unfinished ones
+are kept in memory'''
+
+from collections import deque
+from heapq import heappush
+
+import numpy as np
+
+from .binary_scenario import BinaryScenario
+from .simulator import RoundRobinScheduler, simulate_slices
+
+def read_trace(file_name, chunk_size=65536):
+    '''Yield (identifier, arrival time, burst time) of each process of a trace
+    Text traces are read line by line, and binary ones are read from memory a chunk at a time'''
+
+    previous_arrival = None
+
+    for identifier, arrival_time, burst_time in _trace_records(file_name, chunk_size):
+        if previous_arrival is not None and arrival_time < previous_arrival:
+            raise ValueError("the processes of " + str(file_name) + " must be in arrival order: process "
+                             + str(identifier) + " arrives at " + str(arrival_time))
+        previous_arrival = arrival_time
+
+        yield identifier, arrival_time, burst_time
+
+def _trace_records(file_name, chunk_size):
+    '''Yield the processes of a trace as they're stored in the file'''
+
+    if BinaryScenario.is_binary(file_name):
+        processes = BinaryScenario.read(file_name)
+
+        # Only the pages of the current chunk are brought into memory
+        for start in range(0, len(processes), chunk_size):
+            yield from zip(processes.identifiers[start:start+chunk_size].tolist(),
+                           processes.arrival_times[start:start+chunk_size].tolist(),
+                           processes.burst_times[start:start+chunk_size].tolist())
+        return
+
+    with open(file_name, 'r') as trace_file:
+        for line in trace_file:
+            # Ignoring commentaries and empty lines
+            if line.find('#') != -1 or line == "\n":
+                continue
+
+            line = line.split(' ')
+
+            if line[0] == 'P':
+                # P [identifier] [arrival time] [burst time]
+                yield int(line[1]), int(line[2]), int(line[3])
+
+def trace_windows(file_name, window_length):
+    '''Yield (window start, window end, arrivals) for each window of "window_length"
+    time units where some process arrives. "arrivals" holds the (identifier, arrival
+    time, burst time) of those processes. Windows without arrivals are skipped'''
+
+    if window_length <= 0:
+        raise ValueError("window length must be greater than zero")
+
+    window_start = None
+    arrivals = list()
+
+    for process in read_trace(file_name):
+        if window_start is not None and process[1] >= window_start + window_length:
+            yield window_start, window_start + window_length, arrivals
+            window_start = None
+            arrivals = list()
+
+        if window_start is None:
+            window_start = process[1] - process[1] % window_length
+
+        arrivals.append(process)
+
+    if arrivals:
+        yield window_start, window_start + window_length, arrivals
+
+class StreamingRoundRobinScheduler():
+    '''Round Robin scheduling simulator fed with the processes of a trace as time goes by
+
+    The simulation is kept between windows: "admit" adds the processes of the next
+    window and "advance" runs them up to some time. Finished processes are only
+    summed into the totals, so the memory used depends on the unfinished processes,
+    not on the size of the trace. Processes only become READY at their arrival time
+
+    "run" and "run_batch" evaluate a quantum without changing the simulation: from
+    the current state, every unfinished process is simulated until it finishes, so
+    the history before the window is never simulated again'''
+
+    def __init__(self, debug=None):
+        if debug:
+            self.debug = debug
+        else:
+            self.debug = False
+
+        self.current_time = 0
+
+        # Columns of the live processes, one slot per process. The slot of a finished
+        # process is given to the next one admitted, so they only grow with the live processes
+        self.arrival_times = list()
+        self.remaining_burst = list()
+        self.waiting_time = list()
+        self.ready_since = list()
+        self.exit_time = list()
+        self.free_slots = list()
+
+        # Slots of the READY processes, and (arrival time, admission order, slot) of the ones not arrived yet
+        self.ready_queue = deque()
+        self.pending_arrivals = list()
+
+        # Slot put back on the queue by the end of the last time slice, if any
+        self.last_preempted = None
+
+        # Quantity of processes admitted, which orders the ones arriving at the same time
+        self.admitted = 0
+        self.last_arrival = None
+
+        # Totals of the finished processes
+        self.finished_quantity = 0
+        self.total_turnaround_time = 0
+        self.total_waiting_time = 0
+        self.context_switch = -1
+
+        # Changed every time the simulation changes, so cached metrics aren't mixed up
+        self.version = 0
+
+    def admit(self, arrivals):
+        '''Add the (identifier, arrival time, burst time) processes, in arrival order'''
+
+        for _, arrival_time, burst_time in arrivals:
+            if self.last_arrival is not None and arrival_time < self.last_arrival:
+                raise ValueError("processes must be admitted in arrival order")
+            self.last_arrival = arrival_time
+
+            if self.free_slots:
+                slot = self.free_slots.pop()
+                self.arrival_times[slot] = arrival_time
+                self.remaining_burst[slot] = burst_time
+                self.waiting_time[slot] = 0
+                self.ready_since[slot] = arrival_time
+                self.exit_time[slot] = 0
+            else:
+                slot = len(self.arrival_times)
+                self.arrival_times.append(arrival_time)
+                self.remaining_burst.append(burst_time)
+                self.waiting_time.append(0)
+                self.ready_since.append(arrival_time)
+                self.exit_time.append(0)
+
+            if arrival_time > self.current_time:
+                # Admitted in arrival order, so pushing never moves the heap
+                heappush(self.pending_arrivals, (arrival_time, self.admitted, slot))
+            elif self.ready_queue and self.ready_queue[-1] == self.last_preempted:
+                # Arrived during the last time slice, so it gets in the queue before the preempted process
+                self.ready_queue.insert(len(self.ready_queue) - 1, slot)
+            else:
+                self.ready_queue.append(slot)
+
+            self.admitted += 1
+
+        self.version += 1
+
+    def advance(self, quantum, until):
+        '''Simulate with "quantum" while the time is lower than "until", or until every
+        process finishes when it's None
+        A time slice is never interrupted, so the time may end a bit after "until"'''
+
+        quantum = self.effective_quantum(quantum)
+
+        self.current_time, dispatches, finished, preempted = simulate_slices(
+            quantum, self.remaining_burst, self.waiting_time, self.ready_since, self.exit_time,
+            self.ready_queue, self.pending_arrivals, self.current_time, until, self.slice_hook())
+
+        # Without any slice, the last one is still the one of a previous call
+        if dispatches > 0:
+            self.last_preempted = preempted
+
+        self.finished_quantity += len(finished)
+        self.total_turnaround_time += sum(self.exit_time[slot] - self.arrival_times[slot] for slot in finished)
+        self.total_waiting_time += sum(self.waiting_time[slot] for slot in finished)
+        self.context_switch += dispatches
+
+        self.free_slots.extend(finished)
+
+        self.version += 1
+
+    def run(self, quantum):
+        '''Return the metrics of the live processes if "quantum" was used until all of them finish:
+        [average turnaround time, average waiting time, context switches]
+        Like in RoundRobinScheduler.run, the very first dispatch of the trace isn't a
+        context switch, so the switches are the ones "totals" would add'''
+
+        quantum = self.effective_quantum(quantum)
+
+        # Working on copies, the simulation itself doesn't change
+        waiting_time = list(self.waiting_time)
+        exit_time = list(self.exit_time)
+
+        _, dispatches, finished, _ = simulate_slices(
+            quantum, list(self.remaining_burst), waiting_time, list(self.ready_since), exit_time,
+            deque(self.ready_queue), list(self.pending_arrivals), self.current_time, None, self.slice_hook())
+
+        process_quantity = len(finished)
+        if process_quantity == 0:
+            return list([0.0, 0.0, 0])
+
+        total_turnaround_time = sum(exit_time[slot] - self.arrival_times[slot] for slot in finished)
+        total_waiting_time = sum(waiting_time[slot] for slot in finished)
+
+        # Before any dispatch the context switches start from -1, like in totals
+        if self.context_switch < 0:
+            dispatches += self.context_switch
+
+        return list([total_turnaround_time / process_quantity, total_waiting_time / process_quantity, dispatches])
+
+    def run_batch(self, quanta):
+        '''Return an array with the metrics of each quantum, one row per quantum'''
+
+        return np.array([self.run(quantum) for quantum in quanta], dtype=np.float64).reshape(-1, 3)
+
+    def slice_hook(self):
+        '''Return what is called after each slice when debugging, otherwise None'''
+
+        if not self.debug:
+            return None
+
+        def on_slice(slot, start_time, end_time):
+            print("current_time:", end_time, " slot:", slot, " remaining_burst:", self.remaining_burst[slot])
+
+        return on_slice
+
+    effective_quantum = staticmethod(RoundRobinScheduler.effective_quantum)
+
+    def fingerprint(self):
+        '''Return an identification of the current simulation state'''
+
+        return "stream-" + str(id(self)) + "-" + str(self.version)
+
+    def live_quantity(self):
+        '''Return the quantity of processes admitted and not finished yet'''
+
+        return len(self.arrival_times) - len(self.free_slots)
+
+    def totals(self):
+        '''Return the metrics of every process finished so far, like RoundRobinScheduler.run'''
+
+        if self.finished_quantity == 0:
+            return list([0.0, 0.0, max(self.context_switch, 0)])
+
+        return list([self.total_turnaround_time / self.finished_quantity,
+                     self.total_waiting_time / self.finished_quantity,
+                     self.context_switch])
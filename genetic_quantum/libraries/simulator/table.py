@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the metrics table class'''
+
+import numpy as np
+
+from .simulator import RoundRobinScheduler
+
+class MetricsTable():
+    '''Metrics of every effective quantum between "min_quantum" and "max_quantum"
+
+    Once it's filled, evaluating a quantum is just a lookup, and the exact
+    Pareto front of the scenario can be taken from it'''
+
+    def __init__(self, min_quantum, max_quantum, metrics, fingerprint=None):
+        self.min_quantum = min_quantum
+        self.max_quantum = max_quantum
+
+        # One row per quantum: [avg_turnaround_time, avg_waiting_time, context_switch]
+        self.metrics = np.asarray(metrics, dtype=np.float64).reshape(-1, 3)
+
+        # Fingerprint of the scenario used to fill the table
+        self.fingerprint = fingerprint
+
+        if len(self.metrics) != (self.max_quantum - self.min_quantum + 1):
+            raise ValueError("the table must have one row per quantum from "
+                             + str(self.min_quantum) + " to " + str(self.max_quantum))
+
+    @classmethod
+    def sweep(cls, scheduler, min_quantum, max_quantum):
+        '''Evaluate every effective quantum of [min_quantum, max_quantum] once'''
+
+        min_quantum = RoundRobinScheduler.effective_quantum(min_quantum)
+        max_quantum = RoundRobinScheduler.effective_quantum(max_quantum)
+
+        metrics = scheduler.run_batch(np.arange(min_quantum, max_quantum + 1))
+
+        return cls(min_quantum, max_quantum, metrics, scheduler.fingerprint())
+
+    def run(self, quantum):
+        '''Return the metrics of "quantum"'''
+
+        quantum = RoundRobinScheduler.effective_quantum(quantum)
+
+        if not self.min_quantum <= quantum <= self.max_quantum:
+            raise ValueError("quantum " + str(quantum) + " is out of the table range ["
+                             + str(self.min_quantum) + ", " + str(self.max_quantum) + "]")
+
+        avg_turnaround_time, avg_waiting_time, context_switch = self.metrics[quantum - self.min_quantum].tolist()
+
+        return list([avg_turnaround_time, avg_waiting_time, int(context_switch)])
+
+    def run_batch(self, quanta):
+        '''Return the metrics of each quantum in "quanta"'''
+
+        quanta = np.ceil(np.asarray(quanta, dtype=np.float64)).astype(np.int64)
+
+        if quanta.size > 0 and (quanta.min() < self.min_quantum or quanta.max() > self.max_quantum):
+            raise ValueError("quanta out of the table range ["
+                             + str(self.min_quantum) + ", " + str(self.max_quantum) + "]")
+
+        return self.metrics[quanta - self.min_quantum]
+
+    def fingerprint_matches(self, scheduler):
+        '''Tell if this table was filled with the same scenario of "scheduler"'''
+
+        return self.fingerprint == scheduler.fingerprint()
+
+    def pareto_front(self):
+        '''Return the quanta whose metrics aren't dominated by any other quantum
+
+        In lexicographic order, every row can only be dominated by a previous one,
+        and a dominated row never dominates a row that isn't already dominated by
+        the front, so each row is only compared with the front found so far'''
+
+        order = np.lexsort(self.metrics.T[::-1])
+
+        front = list()
+        for index in order.tolist():
+            row = self.metrics[index]
+
+            if front:
+                front_rows = self.metrics[front]
+                dominated = np.all(front_rows <= row, axis=1) & np.any(front_rows < row, axis=1)
+                if dominated.any():
+                    continue
+
+            front.append(index)
+
+        front.sort()
+
+        return [index + self.min_quantum for index in front]
+
+    def save(self, file_name):
+        '''Write the table into "file_name"'''
+
+        output = "# Metrics table\n"
+        output += "# Fingerprint: " + str(self.fingerprint) + "\n"
+        output += "# [QUANTUM] [TURNAROUND TIME] [WAITING TIME] [CONTEXT SWITCHES]\n"
+
+        quantum = self.min_quantum
+        for avg_turnaround_time, avg_waiting_time, context_switch in self.metrics.tolist():
+            output += (str(quantum) + " "
+                       + str(avg_turnaround_time) + " "
+                       + str(avg_waiting_time) + " "
+                       + str(int(context_switch)) + "\n")
+            quantum += 1
+
+        with open(file_name, "w") as file_:
+            file_.write(output)
+
+    @classmethod
+    def load(cls, file_name):
+        '''Read a table written by save()'''
+
+        fingerprint = None
+        quanta = list()
+        metrics = list()
+
+        with open(file_name, "r") as file_:
+            for line in file_:
+                if line.startswith("# Fingerprint: "):
+                    fingerprint = line[len("# Fingerprint: "):].strip()
+                    continue
+
+                # Ignoring commentaries and empty lines
+                if line.find('#') != -1 or line.strip() == "":
+                    continue
+
+                # [quantum] [turnaround time] [waiting time] [context switches]
+                line = line.split()
+                quanta.append(int(line[0]))
+                metrics.append([float(line[1]), float(line[2]), float(line[3])])
+
+        if not quanta or quanta != list(range(quanta[0], quanta[0] + len(quanta))):
+            raise ValueError("the table in " + str(file_name) + " must have one row per quantum, in order")
+
+        return cls(quanta[0], quanta[-1], metrics, fingerprint)
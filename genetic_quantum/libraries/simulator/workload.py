@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''File of the synthetic workload generator class'''
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from .processes import ProcessTable
+
+class WorkloadGenerator():
+    '''Seeded generator of synthetic scenarios
+
+    Burst distributions:
+        "uniform": every burst between "min_burst" and "max_burst"
+        "bimodal": "long_fraction" of long bursts and the others short, like Dataset-2_20-80
+        "heavy-tailed": Pareto bursts starting at "min_burst", cut at "max_burst"
+
+    Arrivals:
+        "zero": every process arrives at time zero
+        "poisson": Poisson process with "arrival_rate" arrivals per time unit'''
+
+    BURST_DISTRIBUTIONS = ("uniform", "bimodal", "heavy-tailed")
+    ARRIVALS = ("zero", "poisson")
+
+    def __init__(self, seed=None, min_burst=1, max_burst=300, long_fraction=0.2, pareto_shape=1.5, arrival_rate=0.05):
+        self.seed = seed
+        self.random = np.random.default_rng(seed)
+
+        self.min_burst = min_burst
+        self.max_burst = max_burst
+
+        # Bimodal bursts: long ones in the upper 20% of the range, short ones in the lower 20%
+        self.long_fraction = long_fraction
+
+        self.pareto_shape = pareto_shape
+        self.arrival_rate = arrival_rate
+
+    def generate(self, process_quantity, burst_distribution="uniform", arrival="zero"):
+        '''Return a new process table'''
+
+        identifiers = np.arange(1, process_quantity + 1)
+        burst_times = self.burst_times(process_quantity, burst_distribution)
+        arrival_times = self.arrival_times(process_quantity, arrival)
+
+        return ProcessTable(identifiers, arrival_times, burst_times)
+
+    def burst_times(self, process_quantity, distribution):
+        '''Return "process_quantity" bursts of "distribution"'''
+
+        if distribution == "uniform":
+            return self.random.integers(self.min_burst, self.max_burst, size=process_quantity, endpoint=True)
+
+        if distribution == "bimodal":
+            band = max((self.max_burst - self.min_burst) // 5, 0)
+            short_bursts = self.random.integers(self.min_burst, self.min_burst + band, size=process_quantity, endpoint=True)
+            long_bursts = self.random.integers(self.max_burst - band, self.max_burst, size=process_quantity, endpoint=True)
+            is_long = self.random.random(process_quantity) < self.long_fraction
+            return np.where(is_long, long_bursts, short_bursts)
+
+        if distribution == "heavy-tailed":
+            bursts = self.min_burst * (1 + self.random.pareto(self.pareto_shape, size=process_quantity))
+            return np.minimum(np.floor(bursts), self.max_burst).astype(np.int64)
+
+        raise ValueError("unknown burst distribution: " + str(distribution))
+
+    def arrival_times(self, process_quantity, arrival):
+        '''Return "process_quantity" arrival times of "arrival" kind, in order'''
+
+        if arrival == "zero":
+            return np.zeros(process_quantity, dtype=np.int64)
+
+        if arrival == "poisson":
+            interarrival_times = self.random.exponential(1 / self.arrival_rate, size=process_quantity)
+            return np.floor(np.cumsum(interarrival_times)).astype(np.int64)
+
+        raise ValueError("unknown arrival kind: " + str(arrival))
+
+    def write(self, processes, file_name, description=""):
+        '''Write "processes" as a scenario text file'''
+
+        lines = ["# Synthetic scenario " + description,
+                 "# Seed: " + str(self.seed),
+                 "# P [identifier] [arrival time] [burst time]",
+                 ""]
+
+        for identifier, arrival_time, burst_time in zip(processes.identifiers.tolist(),
+                                                        processes.arrival_times.tolist(),
+                                                        processes.burst_times.tolist()):
+            lines.append("P " + str(identifier) + " " + str(arrival_time) + " " + str(burst_time))
+
+        with open(file_name, "w") as file_:
+            file_.write("\n".join(lines) + "\n")
+
+    def write_scenarios(self, folder, sizes, burst_distribution="uniform", arrival="zero"):
+        '''Write one scenario for each size in "sizes" into "folder"
+        Return the file names'''
+
+        Path(folder).mkdir(parents=True, exist_ok=True)
+
+        file_names = list()
+        for process_quantity in sizes:
+            description = burst_distribution + "_" + arrival + "-arrival_" + str(process_quantity) + "-processes"
+            file_name = str(Path(folder) / (description + "_seed-" + str(self.seed) + ".txt"))
+
+            self.write(self.generate(process_quantity, burst_distribution, arrival), file_name, description)
+            file_names.append(file_name)
+
+        return file_names
+
+if __name__ == "__main__":
+    # Usage: python -m libraries.simulator.workload FOLDER [options]
+    parser = argparse.ArgumentParser(description="Write synthetic scenarios")
+    parser.add_argument("folder")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**2, 10**3, 10**4, 10**5, 10**6])
+    parser.add_argument("--bursts", choices=WorkloadGenerator.BURST_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--arrival", choices=WorkloadGenerator.ARRIVALS, default="zero")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-burst", type=int, default=1)
+    parser.add_argument("--max-burst", type=int, default=300)
+    parser.add_argument("--arrival-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    generator = WorkloadGenerator(args.seed, args.min_burst, args.max_burst, arrival_rate=args.arrival_rate)
+    for file_name in generator.write_scenarios(args.folder, args.sizes, args.bursts, args.arrival):
+        print(file_name)
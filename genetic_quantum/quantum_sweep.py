@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''Evaluate every quantum of a scenario and show the exact Pareto front
+
+Usage: ./quantum_sweep.py SCENARIO MIN_QUANTUM MAX_QUANTUM [TABLE_FILE] [--arrival-aware]
+
+When TABLE_FILE is given, the metrics of every quantum are saved there, and
+it can be given to genetic_quantum.py to use the table instead of the simulator'''
+
+from libraries.simulator.simulator import RoundRobinScheduler, ZeroArrivalRoundRobinScheduler
+from libraries.simulator.table import MetricsTable
+
+import argparse
+
+parser = argparse.ArgumentParser(description="Evaluate every quantum of a scenario and show the exact Pareto front")
+parser.add_argument("scenario")
+parser.add_argument("min_quantum", type=int)
+parser.add_argument("max_quantum", type=int)
+parser.add_argument("table_file", nargs="?", default=None,
+                    help="file where the metrics of every quantum are saved")
+parser.add_argument("--arrival-aware", action="store_true",
+                    help="processes only become READY at their arrival time")
+args = parser.parse_args()
+
+round_robin = RoundRobinScheduler(args.scenario, arrival_aware=args.arrival_aware)
+
+# When every process arrives at time zero the metrics are calculated without simulation
+if round_robin.zero_arrival_time():
+    round_robin = ZeroArrivalRoundRobinScheduler(args.scenario, arrival_aware=args.arrival_aware,
+                                                 processes=round_robin.processes)
+
+table = MetricsTable.sweep(round_robin, args.min_quantum, args.max_quantum)
+
+if args.table_file is not None:
+    table.save(args.table_file)
+
+max_turnaround_time, max_waiting_time, max_context_switches = table.metrics.max(axis=0).tolist()
+
+# A metric that is zero for every quantum stays zero when normalized
+max_turnaround_time = max_turnaround_time or 1
+max_waiting_time = max_waiting_time or 1
+max_context_switches = max_context_switches or 1
+
+# Same columns of genetic_quantum.py output, normalized by the highest values of the whole table
+# [NAME] [QUANTUM] [NORMALIZED TURNAROUND TIME] [NORMALIZED WAITING TIME] [NORMALIZED CONTEXT SWITCHES] [TURNAROUND TIME] [WAITING TIME] [CONTEXT SWITCHES]
+output = ""
+for quantum in table.pareto_front():
+    avg_turnaround_time, avg_waiting_time, context_switch = table.run(quantum)
+
+    output += "q~" + str(quantum) + " "
+    output += str(quantum) + " "
+    output += str(avg_turnaround_time / max_turnaround_time) + " "
+    output += str(avg_waiting_time / max_waiting_time) + " "
+    output += str(context_switch / max_context_switches) + " "
+    output += str(avg_turnaround_time) + " "
+    output += str(avg_waiting_time) + " "
+    output += str(context_switch) + "\n"
+
+print(output)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Fixtures of the tests, which run from the folder of genetic_quantum.py like the project itself'''
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_FOLDER)
+
+def write_scenario(file_name, processes):
+    '''Write the (identifier, arrival time, burst time) processes into a scenario file'''
+
+    with open(file_name, "w") as file_:
+        file_.write("# test scenario\n\n")
+        for identifier, arrival_time, burst_time in processes:
+            file_.write("P " + str(identifier) + " " + str(arrival_time) + " " + str(burst_time) + "\n")
+
+    return str(file_name)
+
+@pytest.fixture(autouse=True)
+def project_folder(monkeypatch):
+    '''GeneticQantum creates its folders relative to the project folder'''
+
+    monkeypatch.chdir(PROJECT_FOLDER)
+
+@pytest.fixture
+def scenario(tmp_path):
+    '''Scenario of 50 processes arriving along the time, sorted by arrival'''
+
+    generator = np.random.default_rng(7)
+    arrival_times = np.sort(generator.integers(0, 500, size=50)).tolist()
+    burst_times = generator.integers(1, 300, size=50).tolist()
+
+    return write_scenario(tmp_path / "scenario.txt",
+                          [(i + 1, arrival_times[i], burst_times[i]) for i in range(50)])
+
+@pytest.fixture
+def zero_arrival_scenario(tmp_path):
+    '''Scenario of 20 processes, all of them arriving at time zero'''
+
+    generator = np.random.default_rng(11)
+    burst_times = generator.integers(1, 300, size=20).tolist()
+
+    return write_scenario(tmp_path / "zero_arrival.txt", [(i + 1, 0, burst_times[i]) for i in range(20)])
+
+@pytest.fixture
+def idle_scenario(tmp_path):
+    '''Scenario where the processor is idle between arrivals, with processes arriving together'''
+
+    return write_scenario(tmp_path / "idle.txt",
+                          [(1, 0, 5), (2, 3, 2), (3, 20, 4), (4, 21, 1), (5, 21, 6), (6, 40, 3)])
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the binary scenario format'''
+
+import os
+
+import numpy as np
+
+from libraries.simulator.binary_scenario import BinaryScenario
+from libraries.simulator.processes import ProcessTable
+
+def assert_same_processes(processes, expected):
+    assert np.array_equal(processes.identifiers, expected.identifiers)
+    assert np.array_equal(processes.arrival_times, expected.arrival_times)
+    assert np.array_equal(processes.burst_times, expected.burst_times)
+
+def test_round_trip(scenario, tmp_path):
+    expected = ProcessTable.read_text(scenario)
+
+    compiled_file_name = BinaryScenario.compile(scenario, str(tmp_path / "compiled.gqs"))
+
+    assert BinaryScenario.is_binary(compiled_file_name)
+    assert_same_processes(BinaryScenario.read(compiled_file_name, verify=True), expected)
+    assert_same_processes(BinaryScenario.load(compiled_file_name), expected)
+
+    # The text scenario is compiled on the first load and read from the compiled file after it
+    assert_same_processes(BinaryScenario.load(scenario), expected)
+    assert os.path.exists(scenario + BinaryScenario.EXTENSION)
+    assert_same_processes(BinaryScenario.load(scenario), expected)
+
+def test_truncated_file_is_compiled_again(scenario):
+    expected = ProcessTable.read_text(scenario)
+    compiled_file_name = BinaryScenario.compile(scenario)
+
+    with open(compiled_file_name, "r+b") as file_:
+        file_.truncate(os.path.getsize(compiled_file_name) - 8)
+
+    assert_same_processes(BinaryScenario.load(scenario), expected)
+    assert_same_processes(BinaryScenario.read(compiled_file_name, verify=True), expected)
+
+def test_corrupted_file_is_compiled_again(scenario):
+    expected = ProcessTable.read_text(scenario)
+    compiled_file_name = BinaryScenario.compile(scenario)
+
+    with open(compiled_file_name, "r+b") as file_:
+        file_.seek(BinaryScenario.HEADER_SIZE + 3)
+        file_.write(b"\xff")
+
+    # Without "verify" the content isn't hashed, so the corruption goes unnoticed
+    assert not np.array_equal(BinaryScenario.load(scenario).identifiers, expected.identifiers)
+
+    assert_same_processes(BinaryScenario.load(scenario, verify=True), expected)
+    assert_same_processes(BinaryScenario.read(compiled_file_name, verify=True), expected)
+
+def test_damaged_header_is_compiled_again(scenario):
+    expected = ProcessTable.read_text(scenario)
+    compiled_file_name = BinaryScenario.compile(scenario)
+
+    with open(compiled_file_name, "r+b") as file_:
+        file_.write(b"GARBAGE!")
+
+    assert_same_processes(BinaryScenario.load(scenario), expected)
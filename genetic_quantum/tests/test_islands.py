@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the island model'''
+
+import os
+import time
+
+import pytest
+
+from genetic_quantum import GeneticQantum
+from libraries.nsga2 import islands
+from libraries.nsga2.islands import IslandModel
+from libraries.nsga2.population import Population
+
+class KilledIsland():
+    '''Island 0 dies without reporting, like when it's killed, and the other ones wait for its migrants'''
+
+    def __init__(self, seed):
+        self.island = seed.spawn_key[-1]
+        self.evaluations = 0
+
+    def evolve(self):
+        if self.island == 0:
+            os._exit(9)
+
+        # The migrants of island 0 never come
+        self.migration.inbox.get()
+
+class SizedIsland():
+    '''Island whose best front is its whole population, each genome holding the population size'''
+
+    def __init__(self, population_size, seed):
+        self.population_size = population_size
+        self.evaluations = population_size
+
+    def evolve(self):
+        front = Population(1, 1, 300)
+        for _ in range(self.population_size):
+            front.new_individual([self.population_size])
+
+        return front
+
+def test_killed_island_stops_the_run(monkeypatch):
+    monkeypatch.setattr(islands, "POLL_INTERVAL", 0.1)
+
+    start_time = time.time()
+    with pytest.raises(RuntimeError, match="island 0 stopped without a result"):
+        IslandModel(KilledIsland, dict(), 2).run()
+
+    assert time.time() - start_time < 30
+
+def test_islands_run(scenario):
+    algorithm = GeneticQantum(scenario, 4, 20, 1, 300, 5, 0.9, seed=1, islands=2, migration_interval=2)
+
+    best_front = algorithm.run_islands()
+
+    assert best_front.size > 0
+    assert algorithm.evaluations > 0
+
+def test_population_split_keeps_every_individual(scenario):
+    algorithm = GeneticQantum(scenario, 4, 31, 1, 300, 5, 0.9, seed=1, islands=2)
+    assert algorithm.island_population_sizes == [16, 15]
+
+    genomes = IslandModel(SizedIsland, dict(), 3, population_sizes=[11, 10, 10]).run()
+    assert sorted(genome[0] for genome in genomes) == [10] * 20 + [11] * 11
+
+def test_odd_islands_run(scenario):
+    algorithm = GeneticQantum(scenario, 3, 31, 1, 300, 5, 0.9, seed=2, islands=2, migration_interval=1)
+
+    assert algorithm.run_islands().size > 0
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of NSGA-II over the Genetic quantum problem'''
+
+import pytest
+
+from genetic_quantum import GeneticQantum
+
+@pytest.mark.parametrize("population_size", [40, 41])
+def test_offspring_has_population_size(scenario, population_size):
+    algorithm = GeneticQantum(scenario, 5, population_size, 1, 300, 5, 0.9, seed=1)
+
+    best_front = algorithm.evolve()
+
+    assert algorithm.generations_run == 5
+    assert algorithm.population.size == population_size
+    assert best_front.size > 0
+
+def test_odd_population_size_crossovers(scenario):
+    algorithm = GeneticQantum(scenario, 5, 41, 1, 300, 5, 0.9, seed=1)
+
+    algorithm.population = algorithm.new_population()
+    algorithm.population.initiate(20)
+    algorithm.evaluate(algorithm.population)
+    for _ in algorithm.lazy_non_dominated_sort():
+        pass
+    for individual in algorithm.population.individuals:
+        individual.crowding_distance = 0.0
+
+    assert algorithm.usual_crossover().size == 41
+    assert algorithm.crossover().size == 41
+    assert algorithm.crossover(3).size == 3
+
+def test_same_seed_same_front(scenario):
+    fronts = list()
+    for _ in range(2):
+        best_front = GeneticQantum(scenario, 5, 20, 1, 300, 5, 0.9, seed=3).evolve()
+        fronts.append([individual.genome for individual in best_front.individuals])
+
+    assert fronts[0] == fronts[1]
+
+@pytest.mark.parametrize("in_flight", [0, 3])
+def test_array_population_run(scenario, in_flight):
+    algorithm = GeneticQantum(scenario, 5, 41, 1, 300, 5, 0.9, seed=2, in_flight=in_flight, array_population=True)
+
+    best_front = algorithm.evolve()
+
+    assert type(best_front).__name__ == "ArrayPopulation"
+    assert best_front.size > 0
+    for individual in best_front.individuals:
+        assert individual.evaluated
+        assert len(individual.solutions) == 3
+
+def test_array_population_views():
+    from libraries.nsga2.array_population import ArrayPopulation
+
+    population = ArrayPopulation(1, 1, 300)
+    population.initiate(4)
+
+    individual = population.individual(2)
+    assert not individual.evaluated
+
+    individual.non_normalized_solutions = [10, 20, 3]
+    individual.solutions = [0.5, 1.0, 1.0]
+    assert individual.evaluated
+    assert population.solutions[2].tolist() == [0.5, 1.0, 1.0]
+
+    genome = population.individual(3).genome.tolist()
+    population.replace(2, population.individual(3))
+    assert population.size == 4
+    assert population.individual(2).genome.tolist() == genome
+    assert not population.evaluated.any()
+
+@pytest.mark.parametrize("population_size", [40, 41])
+def test_steady_state_counts_generations_like_generational(scenario, population_size):
+    generational = GeneticQantum(scenario, 6, population_size, 1, 300, 5, 0.9, seed=1)
+    generational.evolve()
+
+    steady_state = GeneticQantum(scenario, 6, population_size, 1, 300, 5, 0.9, seed=1, in_flight=2)
+    steady_state.evolve()
+    steady_state.close()
+
+    assert steady_state.evaluations == generational.evaluations
+    assert steady_state.generations_run == generational.generations_run == 6
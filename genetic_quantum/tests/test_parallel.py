@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the process pool evaluation backend against the serial simulator'''
+
+import numpy as np
+import pytest
+
+from libraries.simulator.parallel import ProcessPoolScheduler
+from libraries.simulator.simulator import RoundRobinScheduler, ZeroArrivalRoundRobinScheduler
+
+QUANTA = np.random.default_rng(3).uniform(0.5, 320, 37).tolist()
+
+@pytest.mark.parametrize("arrival_aware", [False, True])
+@pytest.mark.parametrize("chunk_size", [None, 1, 5])
+def test_pool_matches_serial(scenario, arrival_aware, chunk_size):
+    scheduler = RoundRobinScheduler(scenario, arrival_aware=arrival_aware)
+
+    with ProcessPoolScheduler(scheduler, 2, chunk_size) as pool:
+        assert np.array_equal(pool.run_batch(QUANTA), scheduler.run_batch(QUANTA))
+        assert pool.run(QUANTA[0]) == scheduler.run(QUANTA[0])
+        assert pool.fingerprint() == scheduler.fingerprint()
+
+def test_pool_keeps_the_scheduler_class(zero_arrival_scenario):
+    scheduler = ZeroArrivalRoundRobinScheduler(zero_arrival_scenario)
+
+    with ProcessPoolScheduler(scheduler, 2) as pool:
+        assert np.array_equal(pool.run_batch(QUANTA), scheduler.run_batch(QUANTA))
+        assert pool.run_batch([]).shape == (0, 3)
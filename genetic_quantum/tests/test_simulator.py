@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the Round Robin schedulers against the baseline simulation'''
+
+from math import ceil
+
+import numpy as np
+import pytest
+
+from genetic_quantum import GeneticQantum
+from libraries.simulator import simulator
+from libraries.simulator.processes import ProcessTable
+from libraries.simulator.simulator import RoundRobinScheduler, ZeroArrivalRoundRobinScheduler
+
+def read_processes(scenario):
+    '''Return the (arrival time, burst time) of each process of the scenario file'''
+
+    processes = list()
+    with open(scenario) as file_:
+        for line in file_:
+            if line.startswith("P "):
+                _, _, arrival_time, burst_time = line.split()
+                processes.append((int(arrival_time), int(burst_time)))
+
+    return processes
+
+def baseline_round_robin(processes, quantum):
+    '''Baseline simulation, one time unit at a time, with every process READY from
+    the beginning and served in the scenario order'''
+
+    quantum = ceil(quantum)
+    remaining_burst = [burst_time for _, burst_time in processes]
+    exit_time = [0] * len(processes)
+    current_time = 0
+    dispatches = 0
+
+    while any(remaining_burst):
+        for index in range(len(processes)):
+            if remaining_burst[index] == 0:
+                continue
+
+            dispatches += 1
+            for _ in range(quantum):
+                if remaining_burst[index] == 0:
+                    break
+                remaining_burst[index] -= 1
+                current_time += 1
+            exit_time[index] = current_time
+
+    turnaround_time = sum(exit_time) - sum(arrival_time for arrival_time, _ in processes)
+    waiting_time = sum(exit_time) - sum(burst_time for _, burst_time in processes)
+
+    return [turnaround_time / len(processes), waiting_time / len(processes), dispatches - 1]
+
+def baseline_arrival_aware_round_robin(processes, quantum):
+    '''Baseline simulation, one time unit at a time, where each process only gets in
+    the queue at its arrival time, before the process preempted at that time'''
+
+    quantum = ceil(quantum)
+    remaining_burst = [burst_time for _, burst_time in processes]
+    exit_time = [0] * len(processes)
+    arrival_order = sorted(range(len(processes)), key=lambda index: (processes[index][0], index))
+    ready_queue = list()
+    arrived = 0
+    current_time = 0
+    dispatches = 0
+
+    while ready_queue or arrived < len(processes):
+        if not ready_queue:
+            current_time = max(current_time, processes[arrival_order[arrived]][0])
+
+        while arrived < len(processes) and processes[arrival_order[arrived]][0] <= current_time:
+            ready_queue.append(arrival_order[arrived])
+            arrived += 1
+
+        index = ready_queue.pop(0)
+        dispatches += 1
+        for _ in range(quantum):
+            if remaining_burst[index] == 0:
+                break
+            remaining_burst[index] -= 1
+            current_time += 1
+
+        while arrived < len(processes) and processes[arrival_order[arrived]][0] <= current_time:
+            ready_queue.append(arrival_order[arrived])
+            arrived += 1
+
+        if remaining_burst[index] > 0:
+            ready_queue.append(index)
+        else:
+            exit_time[index] = current_time
+
+    turnaround_time = sum(exit_time) - sum(arrival_time for arrival_time, _ in processes)
+    waiting_time = turnaround_time - sum(burst_time for _, burst_time in processes)
+
+    return [turnaround_time / len(processes), waiting_time / len(processes), dispatches - 1]
+
+QUANTA = [1, 2.5, 7, 30, 100, 299, 1000]
+
+def test_run_matches_baseline(scenario):
+    scheduler = RoundRobinScheduler(scenario)
+    processes = read_processes(scenario)
+
+    for quantum in QUANTA:
+        assert scheduler.run(quantum) == pytest.approx(baseline_round_robin(processes, quantum))
+
+    assert np.allclose(scheduler.run_batch(QUANTA),
+                       [baseline_round_robin(processes, quantum) for quantum in QUANTA])
+
+@pytest.mark.parametrize("batch_elements", [10, 50, 120])
+def test_batch_in_chunks(scenario, monkeypatch, batch_elements):
+    # 50 processes: no quantum fits in 10 elements, one quantum in 50 and two in 120
+    monkeypatch.setattr(simulator, "BATCH_ELEMENTS", batch_elements)
+
+    scheduler = RoundRobinScheduler(scenario)
+    processes = read_processes(scenario)
+
+    assert np.allclose(scheduler.run_batch(QUANTA + QUANTA[::-1]),
+                       [baseline_round_robin(processes, quantum) for quantum in QUANTA + QUANTA[::-1]])
+
+def test_zero_arrival_matches_baseline(zero_arrival_scenario):
+    scheduler = ZeroArrivalRoundRobinScheduler(zero_arrival_scenario)
+    simulator = RoundRobinScheduler(zero_arrival_scenario)
+    processes = read_processes(zero_arrival_scenario)
+
+    expected = [baseline_round_robin(processes, quantum) for quantum in QUANTA]
+
+    assert np.allclose([scheduler.run(quantum) for quantum in QUANTA], expected)
+    assert np.allclose(scheduler.run_batch(QUANTA), expected)
+    assert np.allclose(simulator.run_batch(QUANTA), expected)
+
+def test_zero_arrival_batch_with_many_rounds():
+    # Long bursts and small quanta need many rounds, so the batch uses the closed form
+    burst_times = np.random.default_rng(5).integers(1, 20000, size=30)
+    processes = ProcessTable(np.arange(1, 31), np.zeros(30, dtype=np.int64), burst_times)
+    scheduler = ZeroArrivalRoundRobinScheduler("long_bursts", processes=processes)
+
+    quanta = [1, 1.5, 3, 3, 40]
+    expected = [baseline_round_robin(list(zip([0] * 30, burst_times.tolist())), quantum) for quantum in quanta]
+
+    assert np.allclose(scheduler.run_batch(quanta), expected)
+    assert np.allclose(RoundRobinScheduler.run_batch(scheduler, quanta), expected)
+
+def test_genetic_quantum_uses_the_closed_form(zero_arrival_scenario):
+    algorithm = GeneticQantum(zero_arrival_scenario, 2, 10, 1, 300, 5, 0.9, seed=1)
+
+    assert type(algorithm.round_robin.scheduler) is ZeroArrivalRoundRobinScheduler
+    assert algorithm.evolve().size > 0
+
+def test_zero_arrival_needs_zero_arrivals(scenario):
+    with pytest.raises(ValueError):
+        ZeroArrivalRoundRobinScheduler(scenario)
+
+def test_arrival_aware_matches_baseline(scenario):
+    scheduler = RoundRobinScheduler(scenario, arrival_aware=True)
+    processes = read_processes(scenario)
+
+    expected = [baseline_arrival_aware_round_robin(processes, quantum) for quantum in QUANTA]
+
+    assert np.allclose([scheduler.run(quantum) for quantum in QUANTA], expected)
+    assert np.allclose(scheduler.run_batch(QUANTA), expected)
+
+def test_arrival_aware_with_idle_time(idle_scenario):
+    scheduler = RoundRobinScheduler(idle_scenario, arrival_aware=True)
+    processes = read_processes(idle_scenario)
+
+    for quantum in QUANTA:
+        assert scheduler.run(quantum) == pytest.approx(baseline_arrival_aware_round_robin(processes, quantum))
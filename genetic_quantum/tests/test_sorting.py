@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the non-dominated sorting against a brute-force reference'''
+
+import numpy as np
+import pytest
+
+from libraries.nsga2.crowding import crowding_distances
+from libraries.nsga2.sorting import (IncrementalFronts, incremental_ranks, non_dominated_fronts,
+                                     non_dominated_ranks)
+
+def brute_force_ranks(solutions):
+    '''Peels the non-dominated rows off one front at a time.'''
+
+    ranks = np.zeros(len(solutions), dtype=np.int64)
+    remaining = set(range(len(solutions)))
+    rank = 1
+
+    while remaining:
+        front = [i for i in remaining
+                 if not any((solutions[j] <= solutions[i]).all()
+                            and (solutions[j] < solutions[i]).any()
+                            for j in remaining)]
+        for i in front:
+            ranks[i] = rank
+        remaining -= set(front)
+        rank += 1
+
+    return ranks
+
+def random_solutions(size, objectives, seed):
+    '''Integer values, so many rows tie in some objectives'''
+
+    return np.random.default_rng(seed).integers(0, 8, (size, objectives)).astype(float)
+
+@pytest.mark.parametrize("strategy, objectives", [("dominance", 1), ("dominance", 2), ("dominance", 3),
+                                                  ("dominance", 4), ("sweep", 1), ("sweep", 2),
+                                                  ("ens", 3), ("auto", 2), ("auto", 3)])
+@pytest.mark.parametrize("size", [1, 2, 60, 300])
+def test_strategies_match_brute_force(strategy, objectives, size):
+    solutions = random_solutions(size, objectives, size + objectives)
+    expected = brute_force_ranks(solutions)
+
+    assert (non_dominated_ranks(solutions, strategy) == expected).all()
+
+    for rank, front in enumerate(non_dominated_fronts(solutions, strategy), 1):
+        assert front.tolist() == np.flatnonzero(expected == rank).tolist()
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        non_dominated_ranks(random_solutions(5, 3, 0), "bubble")
+
+@pytest.mark.parametrize("objectives", [1, 2, 3])
+def test_incremental_ranks_match_brute_force(objectives):
+    solutions = random_solutions(80, objectives, objectives)
+
+    # Old rows ranked among themselves, new rows with rank 0
+    ranks = np.zeros(80, dtype=np.int64)
+    ranks[:40] = brute_force_ranks(solutions[:40])
+
+    assert (incremental_ranks(solutions, ranks) == brute_force_ranks(solutions)).all()
+
+@pytest.mark.parametrize("objectives", [1, 2, 3])
+def test_incremental_fronts_follow_insertions(objectives):
+    rng = np.random.default_rng(objectives)
+    capacity = 25
+    fronts = IncrementalFronts(capacity + 1)
+    size = 0
+
+    for solution in rng.integers(0, 6, (100, objectives)).astype(float):
+        if size < capacity:
+            fronts.insert(size, solution)
+            size += 1
+        else:
+            fronts.insert(capacity, solution)
+            worst = fronts.remove_worst()
+            if worst != capacity:
+                fronts.move(capacity, worst)
+
+        solutions = fronts.solutions[:size]
+        assert (fronts.ranks[:size] == brute_force_ranks(solutions)).all()
+
+        for front in fronts.fronts:
+            assert np.allclose(fronts.crowding_distances[front],
+                               crowding_distances(fronts.solutions[front]))
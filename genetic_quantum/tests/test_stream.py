@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the streaming simulator against the whole scenario simulation'''
+
+import numpy as np
+import pytest
+
+from libraries.simulator.simulator import RoundRobinScheduler
+from libraries.simulator.stream import StreamingRoundRobinScheduler, read_trace, trace_windows
+
+@pytest.mark.parametrize("window_length", [7, 50, 1000])
+@pytest.mark.parametrize("quantum", [1, 13, 300])
+def test_windowed_totals_match_arrival_aware(scenario, window_length, quantum):
+    stream = StreamingRoundRobinScheduler()
+
+    for _, window_end, arrivals in trace_windows(scenario, window_length):
+        stream.admit(arrivals)
+        stream.advance(quantum, window_end)
+    stream.advance(quantum, None)
+
+    assert stream.live_quantity() == 0
+    assert stream.totals() == pytest.approx(RoundRobinScheduler(scenario, arrival_aware=True).run(quantum))
+
+def test_run_does_not_change_the_simulation(idle_scenario):
+    stream = StreamingRoundRobinScheduler()
+    stream.admit(read_trace(idle_scenario))
+    stream.advance(2, 21)
+
+    version = stream.version
+    metrics = stream.run_batch([1, 2, 5])
+
+    assert stream.version == version
+    assert np.array_equal(metrics, stream.run_batch([1, 2, 5]))
+
+    stream.advance(2, None)
+    assert stream.totals() == pytest.approx(RoundRobinScheduler(idle_scenario, arrival_aware=True).run(2))
+
+def test_idle_windows(idle_scenario):
+    stream = StreamingRoundRobinScheduler()
+
+    for _, window_end, arrivals in trace_windows(idle_scenario, 10):
+        stream.admit(arrivals)
+        stream.advance(3, window_end)
+    stream.advance(3, None)
+
+    assert stream.totals() == pytest.approx(RoundRobinScheduler(idle_scenario, arrival_aware=True).run(3))
+
+def test_unordered_trace(tmp_path):
+    trace = tmp_path / "unordered.txt"
+    trace.write_text("P 1 10 5\nP 2 3 2\n")
+
+    with pytest.raises(ValueError):
+        list(read_trace(str(trace)))
+
+@pytest.mark.parametrize("quantum", [1, 13, 300])
+def test_run_counts_switches_like_the_simulator(scenario, quantum):
+    stream = StreamingRoundRobinScheduler()
+    stream.admit(read_trace(scenario))
+
+    # From the beginning, the same metrics of the whole scenario simulation
+    assert stream.run(quantum) == pytest.approx(RoundRobinScheduler(scenario, arrival_aware=True).run(quantum))
+
+    # From the middle, the switches run() predicts are the ones totals() gets
+    stream.advance(quantum, 1000)
+    switches = stream.run(quantum)[2]
+    context_switch = stream.context_switch
+
+    stream.advance(quantum, None)
+    assert stream.totals()[2] == context_switch + switches
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the stopping criteria'''
+
+import numpy as np
+import pytest
+
+from libraries.nsga2.termination import (Termination, hypervolume, STAGNATION, HYPERVOLUME,
+                                         TIME_BUDGET, EVALUATION_BUDGET, GENERATIONS)
+from genetic_quantum import GeneticQantum
+
+def brute_force_hypervolume(solutions, reference_point, samples=200000):
+    '''Fraction of random points of the unit box dominated by some row of "solutions"'''
+
+    points = np.random.default_rng(0).random((samples, len(reference_point))) * reference_point
+    dominated = np.zeros(samples, dtype=bool)
+    for solution in solutions:
+        dominated |= (solution <= points).all(axis=1)
+
+    return dominated.mean() * np.prod(reference_point)
+
+@pytest.mark.parametrize("objectives", [1, 2, 3])
+def test_hypervolume_matches_sampling(objectives):
+    solutions = np.random.default_rng(objectives).random((15, objectives))
+    reference_point = np.ones(objectives)
+
+    assert hypervolume(solutions, reference_point) == pytest.approx(brute_force_hypervolume(solutions, reference_point), abs=0.01)
+
+def test_hypervolume_ignores_points_beyond_reference():
+    assert hypervolume([[0.5, 0.5, 0.5], [2, 0, 0]], [1, 1, 1]) == pytest.approx(0.125)
+    assert hypervolume(np.empty((0, 3)), [1, 1, 1]) == 0
+
+def test_stagnation():
+    termination = Termination(stagnation=2)
+    termination.start()
+
+    assert termination.check(10, frozenset([1]), [[1, 1]]) is None
+    assert termination.check(20, frozenset([1]), [[1, 1]]) is None
+    assert termination.check(30, frozenset([1]), [[1, 1]]) == STAGNATION
+
+def test_budgets():
+    assert Termination(max_evaluations=100).check(100, None, [[1]]) == EVALUATION_BUDGET
+    assert Termination(max_evaluations=100).check(99, None, [[1]]) is None
+    assert Termination(time_budget=0).check(0, None, [[1]]) == TIME_BUDGET
+
+def test_hypervolume_front_beyond_first_scale_is_not_a_drop():
+    termination = Termination(hypervolume_epsilon=1e-9, hypervolume_window=1)
+    termination.start()
+
+    assert termination.check(10, None, [[1.0, 1.0]]) is None
+    # A wider front dominating the first one, with a point beyond its worst values
+    assert termination.check(20, None, [[0.5, 3.0], [1.0, 1.0], [3.0, 0.5]]) is None
+    # The same front again: no improvement
+    assert termination.check(30, None, [[0.5, 3.0], [1.0, 1.0], [3.0, 0.5]]) == HYPERVOLUME
+
+def test_run_reports_criterion(scenario):
+    algorithm = GeneticQantum(scenario, 50, 20, 1, 300, 5, 0.9, seed=1, termination=Termination(stagnation=2))
+    algorithm.evolve()
+
+    assert algorithm.stop_reason == STAGNATION
+    assert algorithm.generations_run < 50
+
+    algorithm = GeneticQantum(scenario, 3, 20, 1, 300, 5, 0.9, seed=1)
+    algorithm.evolve()
+
+    assert algorithm.stop_reason == GENERATIONS
+    assert algorithm.generations_run == 3
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+
+'''Tests of the trace replay, one NSGA-II run per time window'''
+
+import pytest
+
+from libraries.simulator.simulator import RoundRobinScheduler
+from trace_replay import TraceReplay
+
+def test_replay_whole_trace(scenario, capsys):
+    replay = TraceReplay(scenario, 100, 3, 10, 1, 300, 5, 0.9, seed=1)
+    replay.run()
+
+    lines = capsys.readouterr().out.splitlines()
+    windows = [line.split() for line in lines if not line.startswith("#")]
+
+    # The scenario has arrivals in every window of 100 time units, from 0 to 500
+    assert [int(window[0]) for window in windows] == [0, 100, 200, 300, 400]
+    assert sum(int(window[2]) for window in windows) == 50
+
+    # Every process finished, with the quantum of the last window used until the end
+    assert replay.stream.live_quantity() == 0
+    assert lines[-1].startswith("# Whole trace")
+
+def test_single_window_matches_simulation(scenario, capsys):
+    # With only one window, the quantum chosen at time zero is used for the whole trace
+    replay = TraceReplay(scenario, 1000, 2, 6, 1, 300, 5, 0.9, seed=2)
+    replay.run()
+
+    lines = capsys.readouterr().out.splitlines()
+    windows = [line.split() for line in lines if not line.startswith("#")]
+    assert len(windows) == 1
+
+    quantum = float(windows[0][4])
+    assert replay.stream.totals() == pytest.approx(RoundRobinScheduler(scenario, arrival_aware=True).run(quantum))
+
+def test_replay_configuration(scenario):
+    replay = TraceReplay(scenario, 100, 2, 6, 1, 300, 5, 0.9, seed=3)
+
+    assert replay.reference_point() is None
+    replay.close()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#
+# Genetic quantum
+# An adaptive process scheduler based on Round-robin and optmized with NSGA-II
+#
+# Instituto Federal de Minas Gerais - Campus Formiga, Brazil
+#
+# Version 1.0
+# (c) 2021 Thales Pinto <ThalesORP@gmail.com> under the GPL
+#          http://www.gnu.org/copyleft/gpl.html
+#
+
+'''Replay a long arrival trace, choosing the quantum again on each time window
+
+Usage: ./trace_replay.py TRACE WINDOW_LENGTH GENERATIONS POPULATION_SIZE GENOME_MIN_VALUE GENOME_MAX_VALUE CROSSOVER_CONSTANT CROSSOVER_RATE
+
+The trace is a scenario, text or binary, with the processes in arrival order.
+For each window, NSGA-II starts from the best front of the previous window and
+the recommended quantum is used until the next window'''
+
+from libraries.nsga2.nsga2 import NSGA2
+from libraries.simulator.cache import CachedScheduler
+from libraries.simulator.stream import StreamingRoundRobinScheduler, trace_windows
+
+from genetic_quantum import GeneticQantum
+
+import argparse
+import time
+
+class TraceReplay(GeneticQantum):
+    '''Genetic quantum over a trace, one NSGA-II run per time window'''
+
+    def __init__(self, trace, window_length, generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate, seed=None):
+        # Calling the NSGA-II constructor, the scheduler isn't read from a scenario file
+        NSGA2.__init__(self, generations, population_size, genome_min_value, genome_max_value, crossover_constant, crossover_rate, seed)
+
+        self.TRACE = trace
+        self.window_length = window_length
+
+        # Simulation kept between the windows
+        self.stream = StreamingRoundRobinScheduler()
+        self.round_robin = None
+
+        # The rest of the GeneticQantum configuration: one generational run per window, evaluated in this thread
+        self.islands = 1
+        self.evaluation_threads = 1
+        self.evaluation_executor = None
+        self.submission_executor = None
+        self.process_pool = None
+
+        # The trace isn't known in advance, so there are no bounds of the metrics
+        self.worst_metrics = None
+
+    def run(self):
+        try:
+            self.replay()
+        finally:
+            self.close()
+
+    def replay(self):
+        '''Choose the quantum of each window and simulate the trace with it, showing the metrics'''
+
+        start_time = time.time()
+
+        quantum = None
+        window_quantity = 0
+        process_quantity = 0
+
+        # [WINDOW START] [WINDOW END] [ARRIVALS] [LIVE PROCESSES] [QUANTUM] [TURNAROUND TIME] [WAITING TIME] [CONTEXT SWITCHES]
+        print("# [WINDOW START] [WINDOW END] [ARRIVALS] [LIVE PROCESSES] [QUANTUM] [TURNAROUND TIME] [WAITING TIME] [CONTEXT SWITCHES]")
+
+        for window_start, window_end, arrivals in trace_windows(self.TRACE, self.window_length):
+            # Admitted before advancing, so the ones arriving during a slice are queued like in RoundRobinScheduler
+            self.stream.admit(arrivals)
+
+            # The quantum of the previous window is used until this window starts
+            if quantum is not None:
+                self.stream.advance(quantum, window_start)
+
+            # The simulation changed, so the metrics of the previous window aren't valid anymore
+            self.round_robin = CachedScheduler(self.stream)
+
+            best_front = NSGA2.run(self)
+            recommended = self.recommended_individual(best_front)
+            quantum = recommended.genome[0]
+
+            # Warm start: the next window begins from this best front
+            self.initial_genomes = [list(individual.genome) for individual in best_front.individuals]
+
+            output = str(window_start) + " "
+            output += str(window_end) + " "
+            output += str(len(arrivals)) + " "
+            output += str(self.stream.live_quantity()) + " "
+            output += str(quantum) + " "
+            output += str(recommended.non_normalized_solutions[0]) + " "
+            output += str(recommended.non_normalized_solutions[1]) + " "
+            output += str(recommended.non_normalized_solutions[2])
+            print(output)
+
+            window_quantity += 1
+            process_quantity += len(arrivals)
+
+        # Finishing the processes still running after the last window
+        if quantum is not None:
+            self.stream.advance(quantum, None)
+
+        runtime = time.time() - start_time
+
+        avg_turnaround_time, avg_waiting_time, context_switch = self.stream.totals()
+
+        print("# Windows: " + str(window_quantity) + "  Processes: " + str(process_quantity)
+              + "  Runtime: " + '%.2f'%(runtime) + "s  Processes per second: " + '%.2f'%(process_quantity / max(runtime, 1e-9)))
+        print("# Whole trace: turnaround time " + str(avg_turnaround_time) + "  waiting time " + str(avg_waiting_time)
+              + "  context switches " + str(context_switch))
+
+    def reference_point(self):
+        '''No reference point: the metrics of the trace aren't bounded beforehand'''
+
+        return None
+
+    def recommended_individual(self, front):
+        '''Return the individual of "front" with the lowest sum of normalized solutions'''
+
+        return min(front.individuals, key=lambda individual: sum(individual.solutions))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a trace, choosing the quantum on each time window")
+    parser.add_argument("trace")
+    parser.add_argument("window_length", type=int)
+    parser.add_argument("generations", type=int)
+    parser.add_argument("population_size", type=int)
+    parser.add_argument("genome_min_value", type=int)
+    parser.add_argument("genome_max_value", type=int)
+    parser.add_argument("crossover_constant", type=int)
+    parser.add_argument("crossover_rate", type=float)
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the random numbers, so the replay can be reproduced")
+    args = parser.parse_args()
+
+    TraceReplay(args.trace, args.window_length, args.generations, args.population_size, args.genome_min_value,
+                args.genome_max_value, args.crossover_constant, args.crossover_rate, args.seed).run()